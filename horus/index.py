@@ -11,25 +11,26 @@ from dash.exceptions import PreventUpdate
 import pathlib
 import os
 import sys
+import uuid
 import requests
-import tempfile
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import matplotlib.pyplot as plt
 from igraph import plot
-import networkx as nx
 from flask import (
     Flask,
     render_template,
     make_response,
     request,
+    session,
     send_from_directory,
     send_file,
     jsonify,
 )
-from data_analysis_module.network_graph import diogenetGraph
+from data_analysis_module.network_graph import get_graph, warm_up
+import data_analysis_module.html_store as hs
 
 
 app = dash.Dash(__name__,
@@ -44,6 +45,79 @@ app = dash.Dash(__name__,
 # app.config.suppress_callback_exceptions = True 
 
 server = app.server
+# Signs the session cookie that identifies the warm start positions of each user
+server.secret_key = os.environ.get("DIOGENET_SECRET_KEY") or os.urandom(24)
+
+
+@server.route(app.config.routes_pathname_prefix + "rendered/<key>")
+def serve_rendered_html(key):
+    rendered_html = hs.get_rendered_html(key)
+    if rendered_html is None:
+        return make_response("Graph not available, please reload the page", 404)
+    response = make_response(rendered_html)
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    return response
+
+
+@server.route(app.config.routes_pathname_prefix + "payload/<key>")
+def serve_vis_payload(key):
+    compressed = "gzip" in request.headers.get("Accept-Encoding", "")
+    payload = hs.get_vis_payload(key, compressed)
+    if payload is None:
+        return make_response("Graph not available, please reload the page", 404)
+    response = make_response(payload)
+    response.headers["Content-Type"] = "application/json"
+    if compressed:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+# Precompute the default views of every dataset in a background thread
+# after startup, so the first visitors only read the caches
+WARM_UP_ON_STARTUP = True
+
+if WARM_UP_ON_STARTUP:
+    warm_up(("global", "local", "communities"), background=True)
+
+
+def get_rendered_html_url(key):
+    return app.get_relative_path("/rendered/" + key)
+
+
+# Renderer of the network graphs: "pyvis" (full html pages) or "visjs"
+# (json payloads drawn by assets/vis_graph.html)
+GRAPH_RENDERER = "pyvis"
+
+# Refine the fr and kk layouts from the positions of the previous graph, so
+# the graph keeps its shape when a filter changes
+LAYOUT_WARM_START = True
+
+
+def get_layout_session():
+    """Return a key identifying the session of the current user
+    """
+    if "layout_session" not in session:
+        session["layout_session"] = uuid.uuid4().hex
+    return session["layout_session"]
+
+
+def render_graph(graph, **render_params):
+    """Render the current subgraph of graph and return the url of the page
+       showing it, None if there is nothing to render
+    """
+    graph.layout_warm_start = LAYOUT_WARM_START
+    if LAYOUT_WARM_START:
+        graph.set_layout_session(get_layout_session())
+    if GRAPH_RENDERER == "visjs":
+        render_key = hs.render_vis_payload(graph, **render_params)
+        if render_key:
+            payload_url = app.get_relative_path("/payload/" + render_key)
+            return app.get_asset_url("vis_graph.html") + "?payload=" + payload_url
+    else:
+        render_key = hs.render_pyvis(graph, **render_params)
+        if render_key:
+            return get_rendered_html_url(render_key)
+    return None
 
 ################################################### Generic Layout #######################################################
 dict_of_datasets = {'Diogenes Laertius': 'diogenes', 'Life of Pythagoras Iamblichus': 'iamblichus'}
@@ -1010,7 +1084,7 @@ def horus_get_global_graph(dataset_selection,
                             label_size_global, 
                             node_size_global):
 
-    grafo = diogenetGraph(
+    grafo = get_graph(
         "global",
         dataset_selection,
         dataset_selection,
@@ -1043,10 +1117,11 @@ def horus_get_global_graph(dataset_selection,
 
     grafo.create_subgraph()
 
-    pvis_graph = None
+    graph_url = None
 
     if plot_type == "pyvis":
-        pvis_graph = grafo.get_pyvis(
+        graph_url = render_graph(
+            grafo,
             min_weight=node_min_size,
             max_weight=node_max_size,
             min_label_size=label_min_size,
@@ -1055,12 +1130,8 @@ def horus_get_global_graph(dataset_selection,
             avoid_centrality=not_centrality,
         )
     
-    if pvis_graph:
-        suffix = ".html"
-        temp_file_name = next(tempfile._get_candidate_names()) + suffix
-        full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-        pvis_graph.write_html(full_filename)
-        return html.Div([html.H6('Global Network',className="mt-1 mb-2 text-center"), html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"150vh", "width": "100%", "padding": "0px", "margin": "0px"})], style={"background-color":"#E6E6E6"})
+    if graph_url:
+        return html.Div([html.H6('Global Network',className="mt-1 mb-2 text-center"), html.Iframe(src=graph_url,style={"height":"150vh", "width": "100%", "padding": "0px", "margin": "0px"})], style={"background-color":"#E6E6E6"})
 
 @app.callback(
     Output("download-dataframe-csv", "data"),
@@ -1122,7 +1193,7 @@ def horus_get_global_graph_centrality(
                                     centrality_index_global_centrality,
                                     label_size_global_centrality,
                                     node_size_global_centrality):
-    global_graph = diogenetGraph(
+    global_graph = get_graph(
             "global",
             dataset_selection_global_centrality,
             dataset_selection_global_centrality,
@@ -1167,10 +1238,11 @@ def horus_get_global_graph_centrality(
             global_graph.pyvis_show_gender = False
 
         global_graph.create_subgraph()
-        pvis_graph = None
+        graph_url = None
 
         if plot_type == "pyvis":
-            pvis_graph = global_graph.get_pyvis(
+            graph_url = render_graph(
+                global_graph,
                 min_weight=node_min_size,
                 max_weight=node_max_size,
                 min_label_size=label_min_size,
@@ -1179,12 +1251,8 @@ def horus_get_global_graph_centrality(
                 avoid_centrality=not_centrality,
             )
 
-        if pvis_graph:
-            suffix = ".html"
-            temp_file_name = next(tempfile._get_candidate_names()) + suffix
-            full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-            pvis_graph.write_html(full_filename)
-            return html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height": "950px", "width": "100%"})
+        if graph_url:
+            return html.Iframe(src=graph_url,style={"height": "950px", "width": "100%"})
 
     if tab == "heatmap_global_cetrality":
         plotly_graph = None
@@ -1197,40 +1265,26 @@ def horus_get_global_graph_centrality(
             for m_filter in filters:
                 global_graph.set_edges_filter(m_filter)
 
-        def round_list_values(list_in):
-            return [round(value, 4) for value in list_in]
-
-        calculated_degree = [round(value) for value in global_graph.calculate_degree()]
-        calculated_betweenness = round_list_values(global_graph.calculate_betweenness())
-        calculated_closeness = round_list_values(global_graph.calculate_closeness())
-        calculated_eigenvector = round_list_values(global_graph.calculate_eigenvector())
-
-        dict_global_data_tables ={
-            "Phylosopher": global_graph.get_vertex_names(),
-            "Degree": calculated_degree,
-            "Betweeness": calculated_betweenness,
-            "Closeness": calculated_betweenness,
-            "Eigenvector": calculated_eigenvector 
-        }
+        df_global_data_tables = global_graph.centrality_table(normalized=True).round(4).reset_index()
 
         interpolated_data = {
-            "Phylosopher": dict_global_data_tables["Phylosopher"],
+            "Phylosopher": df_global_data_tables["Phylosopher"],
             "Degree": np.interp(
-                dict_global_data_tables["Degree"], (min(dict_global_data_tables["Degree"]), max(dict_global_data_tables["Degree"])), (0, +1)
+                df_global_data_tables["Degree"], (min(df_global_data_tables["Degree"]), max(df_global_data_tables["Degree"])), (0, +1)
             ),
             "Betweeness": np.interp(
-                dict_global_data_tables["Betweeness"],
-                (min(dict_global_data_tables["Betweeness"]), max(dict_global_data_tables["Betweeness"])),
+                df_global_data_tables["Betweeness"],
+                (min(df_global_data_tables["Betweeness"]), max(df_global_data_tables["Betweeness"])),
                 (0, +1),
             ),
             "Closeness": np.interp(
-                dict_global_data_tables["Closeness"],
-                (min(dict_global_data_tables["Closeness"]), max(dict_global_data_tables["Closeness"])),
+                df_global_data_tables["Closeness"],
+                (min(df_global_data_tables["Closeness"]), max(df_global_data_tables["Closeness"])),
                 (0, +1),
             ),
             "Eigenvector": np.interp(
-                dict_global_data_tables["Eigenvector"],
-                (min(dict_global_data_tables["Eigenvector"]), max(dict_global_data_tables["Eigenvector"])),
+                df_global_data_tables["Eigenvector"],
+                (min(df_global_data_tables["Eigenvector"]), max(df_global_data_tables["Eigenvector"])),
                 (0, +1),
             ),
         }
@@ -1262,30 +1316,7 @@ def horus_get_global_graph_centrality(
             for m_filter in filters:
                 global_graph.set_edges_filter(m_filter)
         
-        def round_list_values(list_in):
-            return [round(value, 4) for value in list_in]
-
-        #Networkx Metrics
-        calculated_networkx_global_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(global_graph.networkx_subgraph).items())[1])
-        calculated_networkx_global_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(global_graph.networkx_subgraph).items())[1])
-        calculated_networkx_global_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(global_graph.networkx_subgraph).items())[1])
-        calculated_networkx_global_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(global_graph.networkx_subgraph).items())[1])
-
-        # Igraph Metrics
-        calculated_degree = [round(value) for value in global_graph.calculate_degree()]
-        calculated_betweenness = round_list_values(global_graph.calculate_betweenness())
-        calculated_closeness = round_list_values(global_graph.calculate_closeness())
-        calculated_eigenvector = round_list_values(global_graph.calculate_eigenvector())
-
-        dict_global_data_tables ={
-            "Phylosopher": global_graph.get_vertex_names(),
-            "Degree": round_list_values(calculated_networkx_global_degree),
-            "Betweeness": round_list_values(calculated_networkx_global_betweenness),
-            "Closeness": round_list_values(calculated_networkx_global_closeness),
-            "Eigenvector": round_list_values(calculated_networkx_global_eigenvector) 
-        }
-
-        df_global_data_tables = pd.DataFrame(dict_global_data_tables)
+        df_global_data_tables = global_graph.centrality_table(normalized=True).round(4).reset_index()
 
         dt = dash_table.DataTable( 
             id='table-global-graph', 
@@ -1304,7 +1335,7 @@ def horus_get_global_graph_centrality(
             sort_mode='single',
             sort_by=[{'column_id': 'Degree', 'direction': 'asc'}]
         )
-        foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('Networkx', href='https://networkx.org/documentation/stable/', target='_blank')])
+        foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('igraph', href='https://igraph.org/python/', target='_blank')])
 
         return [html.H6('Centrality Scores',className="mt-1 mb-2 text-center"), html.Hr(className='py-0'), dt, foot_note]
 
@@ -1333,7 +1364,7 @@ def update_table_global_centrality(
                 label_size_global_centrality,
                 node_size_global_centrality
 ):
-    global_graph = diogenetGraph(
+    global_graph = get_graph(
                 "global",
                 dataset_selection_global_centrality,
                 dataset_selection_global_centrality,
@@ -1361,43 +1392,17 @@ def update_table_global_centrality(
         for m_filter in filters:
             global_graph.set_edges_filter(m_filter)
         
-    def round_list_values(list_in):
-        return [round(value, 4) for value in list_in]
-
-    calculated_networkx_global_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(global_graph.networkx_subgraph).items())[1])
-    calculated_networkx_global_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(global_graph.networkx_subgraph).items())[1])
-    calculated_networkx_global_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(global_graph.networkx_subgraph).items())[1])
-    calculated_networkx_global_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(global_graph.networkx_subgraph).items())[1])
-
-    calculated_degree = [round(value) for value in global_graph.calculate_degree()]
-    calculated_betweenness = round_list_values(global_graph.calculate_betweenness())
-    calculated_closeness = round_list_values(global_graph.calculate_closeness())
-    calculated_eigenvector = round_list_values(global_graph.calculate_eigenvector())
-    
-    dict_global_data_tables ={
-        "Phylosopher": global_graph.get_vertex_names(),
-        "Degree": round_list_values(calculated_networkx_global_degree),
-        "Betweeness": round_list_values(calculated_networkx_global_betweenness),
-        "Closeness": round_list_values(calculated_networkx_global_closeness),
-        "Eigenvector": round_list_values(calculated_networkx_global_eigenvector) 
-    }
-
-    df_global_data_tables = pd.DataFrame(dict_global_data_tables)
-    
-    #print(sort_by)
+    sort_column = None
+    ascending = True
     if len(sort_by):
-        dff = df_global_data_tables.sort_values(
-            sort_by[0]['column_id'],
-            ascending=sort_by[0]['direction'] == 'desc',
-            inplace=False
-        )
-    else:
-        # No sort is applied
-        dff = df_global_data_tables
+        sort_column = sort_by[0]['column_id']
+        ascending = sort_by[0]['direction'] == 'desc'
+
+    dff = global_graph.get_centrality_table_page(
+        page_current, page_size, sort_column, ascending, normalized=True
+    )
 
-    return dff.iloc[
-        page_current*page_size:(page_current+ 1)*page_size
-    ].to_dict('records')
+    return dff.round(4).to_dict('records')
 
 @app.callback(
     Output("download-dataframe-csv-global", "data"),
@@ -1448,7 +1453,7 @@ def get_philosopher_local(dataset_selection,
 
     graph_filter = graph_filter
 
-    local_graph = diogenetGraph(
+    local_graph = get_graph(
         "local",
         dataset_selection,
         dataset_selection,
@@ -1513,7 +1518,7 @@ def horus_get_local_graph(dataset_selection,
                         label_size,  
                         node_size):
 
-    local_graph = diogenetGraph(
+    local_graph = get_graph(
         "local",
         dataset_selection,
         dataset_selection,
@@ -1569,12 +1574,13 @@ def horus_get_local_graph(dataset_selection,
         local_graph.pyvis_show_gender = False
 
     local_graph.create_subgraph()
-    pvis_graph = None
+    graph_url = None
 
     graph_layout = "fr"
 
     if plot_type == "pyvis":
-        pvis_graph = local_graph.get_pyvis(
+        graph_url = render_graph(
+            local_graph,
             min_weight=node_min_size,
             max_weight=node_max_size,
             min_label_size=label_min_size,
@@ -1583,12 +1589,8 @@ def horus_get_local_graph(dataset_selection,
             avoid_centrality=not_centrality,
         )
 
-    if pvis_graph:
-            suffix = ".html"
-            temp_file_name = next(tempfile._get_candidate_names()) + suffix
-            full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-            pvis_graph.write_html(full_filename)
-            return html.Div([html.H6('Local Network',className="mt-1 mb-2 text-center"), html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"95%", "width": "100%", "padding": "0px", "margin": "0px"})], style={"background-color":"#E6E6E6", "padding": "0px", "margin": "0px", "height":"100%"})
+    if graph_url:
+            return html.Div([html.H6('Local Network',className="mt-1 mb-2 text-center"), html.Iframe(src=graph_url,style={"height":"95%", "width": "100%", "padding": "0px", "margin": "0px"})], style={"background-color":"#E6E6E6", "padding": "0px", "margin": "0px", "height":"100%"})
 
 @app.callback(Output('confirm_warning_tie_local', 'displayed'),
               Input('graph_filter_local', 'value'))
@@ -1638,7 +1640,7 @@ def get_philosopher_local_centrality(dataset_selection,
 
     graph_filter = graph_filter
 
-    local_graph = diogenetGraph(
+    local_graph = get_graph(
         "local",
         dataset_selection,
         dataset_selection,
@@ -1708,7 +1710,7 @@ def horus_get_local_graph_centrality(
                                     centrality_index,
                                     label_size,  
                                     node_size):
-    local_graph = diogenetGraph(
+    local_graph = get_graph(
         "local",
         dataset_selection,
         dataset_selection,
@@ -1735,29 +1737,6 @@ def horus_get_local_graph_centrality(
         for m_filter in filters:
             local_graph.set_edges_filter(m_filter)
 
-    def round_list_values(list_in):
-        return [round(value, 4) for value in list_in]
-
-    #Networkx Metrics
-    calculated_networkx_local_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(local_graph.networkx_subgraph).items())[1])
-
-    # igraph Metrics
-    calculated_degree = [round(value) for value in local_graph.calculate_degree()]
-    calculated_betweenness = round_list_values(local_graph.calculate_betweenness())
-    calculated_closeness = round_list_values(local_graph.calculate_closeness())
-    calculated_eigenvector = round_list_values(local_graph.calculate_eigenvector())
-
-    dict_local_data_tables ={
-        "Phylosopher": local_graph.get_vertex_names(),
-        "Degree": round_list_values(calculated_networkx_local_degree),
-        "Betweeness": round_list_values(calculated_networkx_local_betweenness),
-        "Closeness": round_list_values(calculated_networkx_local_closeness),
-        "Eigenvector": round_list_values(calculated_networkx_local_eigenvector) 
-    }
-
     if tab == "graph_local_cetrality":
     
         if dataset_selection == 'diogenes':
@@ -1789,12 +1768,13 @@ def horus_get_local_graph_centrality(
             local_graph.pyvis_show_gender = False
 
         local_graph.create_subgraph()
-        pvis_graph = None
+        graph_url = None
 
         graph_layout = "fr"
 
         if plot_type == "pyvis":
-            pvis_graph = local_graph.get_pyvis(
+            graph_url = render_graph(
+                local_graph,
                 min_weight=node_min_size,
                 max_weight=node_max_size,
                 min_label_size=label_min_size,
@@ -1803,33 +1783,30 @@ def horus_get_local_graph_centrality(
                 avoid_centrality=not_centrality,
             )
 
-        if pvis_graph:
-                suffix = ".html"
-                temp_file_name = next(tempfile._get_candidate_names()) + suffix
-                full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-                pvis_graph.write_html(full_filename)
-                return html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"1100px", "width": "100%"})
+        if graph_url:
+                return html.Iframe(src=graph_url,style={"height":"1100px", "width": "100%"})
 
     if tab == "heatmap_local_cetrality":
+        df_local_data_tables = local_graph.centrality_table(normalized=True).round(4).reset_index()
 
         interpolated_data = {
-            "Phylosopher": dict_local_data_tables["Phylosopher"],
+            "Phylosopher": df_local_data_tables["Phylosopher"],
             "Degree": np.interp(
-                dict_local_data_tables["Degree"], (min(dict_local_data_tables["Degree"]), max(dict_local_data_tables["Degree"])), (0, +1)
+                df_local_data_tables["Degree"], (min(df_local_data_tables["Degree"]), max(df_local_data_tables["Degree"])), (0, +1)
             ),
             "Betweeness": np.interp(
-                dict_local_data_tables["Betweeness"],
-                (min(dict_local_data_tables["Betweeness"]), max(dict_local_data_tables["Betweeness"])),
+                df_local_data_tables["Betweeness"],
+                (min(df_local_data_tables["Betweeness"]), max(df_local_data_tables["Betweeness"])),
                 (0, +1),
             ),
             "Closeness": np.interp(
-                dict_local_data_tables["Closeness"],
-                (min(dict_local_data_tables["Closeness"]), max(dict_local_data_tables["Closeness"])),
+                df_local_data_tables["Closeness"],
+                (min(df_local_data_tables["Closeness"]), max(df_local_data_tables["Closeness"])),
                 (0, +1),
             ),
             "Eigenvector": np.interp(
-                dict_local_data_tables["Eigenvector"],
-                (min(dict_local_data_tables["Eigenvector"]), max(dict_local_data_tables["Eigenvector"])),
+                df_local_data_tables["Eigenvector"],
+                (min(df_local_data_tables["Eigenvector"]), max(df_local_data_tables["Eigenvector"])),
                 (0, +1),
             ),
         }
@@ -1853,7 +1830,7 @@ def horus_get_local_graph_centrality(
         return html.Div([dcc.Graph(figure=plotly_graph, style={"height": "100%", "width": "100%"})], style={"height": "1100px", "width": "auto"})
     
     if tab == "metrics_local_cetrality":
-        df_local_data_tables = pd.DataFrame(dict_local_data_tables)
+        df_local_data_tables = local_graph.centrality_table(normalized=True).round(4).reset_index()
 
         dt = dash_table.DataTable( 
             id='table-local-graph', 
@@ -1873,7 +1850,7 @@ def horus_get_local_graph_centrality(
             sort_by=[{'column_id': 'Degree', 'direction': 'asc'}]
         )
         
-        foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('Networkx', href='https://networkx.org/documentation/stable/', target='_blank')])
+        foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('igraph', href='https://igraph.org/python/', target='_blank')])
         return [html.H6('Centrality Scores',className="mt-1 mb-2 text-center"), html.Hr(className='py-0'), dt, foot_note]
 
 @app.callback(
@@ -1891,7 +1868,7 @@ def update_table_local_centrality(
                 dataset_selection_local_centrality,
                 graph_filter_local_centrality,
 ):
-    local_graph = diogenetGraph(
+    local_graph = get_graph(
                 "local",
                 dataset_selection_local_centrality,
                 dataset_selection_local_centrality,
@@ -1910,45 +1887,17 @@ def update_table_local_centrality(
         for m_filter in filters:
             local_graph.set_edges_filter(m_filter)
         
-    def round_list_values(list_in):
-        return [round(value, 4) for value in list_in]
-
-    #Networkx Metrics
-    calculated_networkx_local_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(local_graph.networkx_subgraph).items())[1])
-    calculated_networkx_local_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(local_graph.networkx_subgraph).items())[1])
-
-    # igraph Metrics
-    calculated_degree = [round(value) for value in local_graph.calculate_degree()]
-    calculated_betweenness = round_list_values(local_graph.calculate_betweenness())
-    calculated_closeness = round_list_values(local_graph.calculate_closeness())
-    calculated_eigenvector = round_list_values(local_graph.calculate_eigenvector())
-
-    dict_local_data_tables ={
-        "Phylosopher": local_graph.get_vertex_names(),
-        "Degree": round_list_values(calculated_networkx_local_degree),
-        "Betweeness": round_list_values(calculated_networkx_local_betweenness),
-        "Closeness": round_list_values(calculated_networkx_local_closeness),
-        "Eigenvector": round_list_values(calculated_networkx_local_eigenvector) 
-    }
-
-    df_local_data_tables = pd.DataFrame(dict_local_data_tables)
-    
-    #print(sort_by)
+    sort_column = None
+    ascending = True
     if len(sort_by):
-        dff = df_local_data_tables.sort_values(
-            sort_by[0]['column_id'],
-            ascending=sort_by[0]['direction'] == 'desc',
-            inplace=False
-        )
-    else:
-        # No sort is applied
-        dff = df_local_data_tables
+        sort_column = sort_by[0]['column_id']
+        ascending = sort_by[0]['direction'] == 'desc'
 
-    return dff.iloc[
-        page_current*page_size:(page_current+ 1)*page_size
-    ].to_dict('records')
+    dff = local_graph.get_centrality_table_page(
+        page_current, page_size, sort_column, ascending, normalized=True
+    )
+
+    return dff.round(4).to_dict('records')
 
 @app.callback(Output('confirm-warning-tie-local-centrality', 'displayed'),
               Input('graph_filter_local_centrality', 'value'))
@@ -2009,7 +1958,7 @@ def horus_get_communities_graph(
                         label_size,  
                         node_size):
 
-    communities_graph = diogenetGraph(
+    communities_graph = get_graph(
         "communities",
         dataset_selection,
         dataset_selection,
@@ -2017,7 +1966,7 @@ def horus_get_communities_graph(
         'travels_blacklist.csv'
     )   
 
-    pvis_graph = None
+    graph_url = None
     warning_tie = False
     node_min_size = int(node_size[0])
     node_max_size = int(node_size[1])
@@ -2029,7 +1978,6 @@ def horus_get_communities_graph(
     plot_type = visualization
     communities_graph.current_centrality_index = "communities"
     communities_graph.comm_alg = str(graph_algorithm)
-    communities_graph.set_graph_layout(graph_layout)
 
     if crossing_ties:
         communities_graph.pyvis_show_crossing_ties = True
@@ -2053,7 +2001,8 @@ def horus_get_communities_graph(
     subgraph = communities_graph
     modularity, clusters_dict = subgraph.identify_communities()
     if plot_type == "pyvis":
-        pvis_graph = communities_graph.get_pyvis(
+        graph_url = render_graph(
+            communities_graph,
             min_weight=node_min_size,
             max_weight=node_max_size,
             min_label_size=label_min_size,
@@ -2061,11 +2010,7 @@ def horus_get_communities_graph(
             layout=graph_layout,
             avoid_centrality=not_centrality,
         )
-        suffix = ".html"
-        temp_file_name = next(tempfile._get_candidate_names()) + suffix
-        full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-        pvis_graph.write_html(full_filename)
-        return [html.H6('Graph',className="mt-1 mb-2 text-center"), html.Hr(className='py-0'), html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"1050px", "width": "100%"})]
+        return [html.H6('Graph',className="mt-1 mb-2 text-center"), html.Hr(className='py-0'), html.Iframe(src=graph_url,style={"height":"1050px", "width": "100%"})]
 
     if plot_type == "igraph":
         pass
@@ -2176,7 +2121,7 @@ def horus_get_communities_treemap(
                         graph_filter,
                         graph_algorithm):
                         
-    communities_graph = diogenetGraph(
+    communities_graph = get_graph(
         "communities",
         dataset_selection,
         dataset_selection,
@@ -2188,8 +2133,6 @@ def horus_get_communities_treemap(
     graph_filter = graph_filter
     communities_graph.current_centrality_index = "communities"
     communities_graph.comm_alg = str(graph_algorithm)
-    graph_layout = "fr"
-    communities_graph.set_graph_layout(graph_layout)
     communities_graph.pyvis_show_crossing_ties = False
 
     if not graph_filter:
@@ -2204,13 +2147,11 @@ def horus_get_communities_treemap(
     subgraph = communities_graph
     modularity, clusters_dict = subgraph.identify_communities()
 
-    communities_index = []
-
-    for i in range(len(subgraph.igraph_subgraph.vs)):
-        if subgraph.igraph_subgraph.vs[i]["name"] in clusters_dict.keys():
-            communities_index.append(
-                clusters_dict[subgraph.igraph_subgraph.vs[i]["name"]]
-            )
+    communities_index = [
+        clusters_dict[name]
+        for name in subgraph.igraph_subgraph.vs["name"]
+        if name in clusters_dict
+    ]
 
     data = {
         "Philosopher": subgraph.igraph_subgraph.vs["name"],
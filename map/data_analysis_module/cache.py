@@ -0,0 +1,68 @@
+"""Module with the in-memory caches shared by the graphs of a process.
+
+.. platform:: Unix, Windows, Mac
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread safe mapping that evicts its least recently used entries
+
+    :param int maxsize: Maximum total size of the stored entries.
+    :param getsizeof: Function returning the size of an entry. When it is
+    not given every entry counts as 1, so maxsize is the number of entries.
+    """
+
+    def __init__(self, maxsize=128, getsizeof=None):
+        self.maxsize = maxsize
+        self.getsizeof = getsizeof
+        self.currsize = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        """Return the entry stored under key and mark it as recently used
+        :param key: Key of the entry
+        :param default: Value returned when there is no entry for key
+        """
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Store value under key evicting the least recently used entries
+        :param key: Key of the entry
+        :param value: Value of the entry. Values bigger than maxsize are not stored
+        """
+        size = self.getsizeof(value) if self.getsizeof is not None else 1
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self.currsize -= self._sizes.pop(key)
+            if size > self.maxsize:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.currsize += size
+            while self.currsize > self.maxsize:
+                old_key, _ = self._data.popitem(last=False)
+                self.currsize -= self._sizes.pop(old_key)
+
+    def clear(self):
+        """Remove every entry
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.currsize = 0
@@ -0,0 +1,109 @@
+"""Module with the community algorithms run by the worker processes of
+    the community comparisons (see diogenetGraph.iter_community_comparison).
+    Workers start from a fresh interpreter and import only this module, so
+    it must not build graphs or read data when imported.
+
+.. platform:: Unix, Windows, Mac
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import igraph
+import numpy as np
+
+# Community algorithms of igraph returning a dendrogram or a clustering
+DENDROGRAM_COMMUNITY_ALGORITHMS = (
+    "community_edge_betweenness",
+    "community_walktrap",
+    "community_fastgreedy",
+)
+CLUSTERING_COMMUNITY_ALGORITHMS = (
+    "community_infomap",
+    "community_spinglass",
+    "community_leiden",
+    "community_leading_eigenvector",
+    "community_label_propagation",
+    "community_multilevel",
+)
+# Seed of the random number generator used by the community algorithms
+COMMUNITY_SEED = 1234
+
+# igraph draws its random numbers from a single process-wide generator, so
+# seeded calculations take turns on it
+_random_number_generator_lock = threading.Lock()
+
+
+@contextmanager
+def seeded_random_number_generator(seed):
+    """Make igraph use a private random number generator seeded with seed,
+    one thread at a time, so seeded results do not depend on other threads
+
+    :param int seed: Seed of the random number generator
+    """
+    with _random_number_generator_lock:
+        igraph.set_random_number_generator(random.Random(seed))
+        try:
+            yield
+        finally:
+            igraph.set_random_number_generator(random)
+
+
+def run_dendrogram_algorithm(graph, algorithm):
+    """Find the communities of graph with an algorithm returning a dendrogram
+
+    Dendrograms of disconnected graphs can not be cut, so the algorithm runs
+    on every connected component, each dendrogram is cut at its optimal
+    count and the memberships are put together. Components of one or two
+    vertices are a community each.
+
+    :param graph: igraph graph
+    :param str algorithm: One of DENDROGRAM_COMMUNITY_ALGORITHMS
+    :rtype: :py:class:`igraph.VertexClustering`
+    """
+    membership = np.zeros(graph.vcount(), dtype=int)
+    communities = 0
+    for vertices in graph.components():
+        if len(vertices) <= 2:
+            membership[vertices] = communities
+            communities += 1
+            continue
+        dendrogram = getattr(graph.induced_subgraph(vertices), algorithm)()
+        component_membership = dendrogram.as_clustering(
+            dendrogram.optimal_count
+        ).membership
+        membership[vertices] = np.array(component_membership) + communities
+        communities += max(component_membership) + 1
+    return igraph.VertexClustering(graph, membership.tolist())
+
+
+def run_community_algorithm(graph, algorithm):
+    """Find the communities of graph
+
+    :param graph: igraph graph
+    :param str algorithm: Name of an igraph community method, one of
+    DENDROGRAM_COMMUNITY_ALGORITHMS or CLUSTERING_COMMUNITY_ALGORITHMS
+    :return: The communities. Dendrograms are cut where the modularity is
+    maximal, see run_dendrogram_algorithm
+    :rtype: :py:class:`igraph.VertexClustering`
+    """
+    if algorithm in DENDROGRAM_COMMUNITY_ALGORITHMS:
+        return run_dendrogram_algorithm(graph, algorithm)
+    if algorithm in CLUSTERING_COMMUNITY_ALGORITHMS:
+        return getattr(graph, algorithm)()
+    raise ValueError("Unknown community algorithm: {}".format(algorithm))
+
+
+def time_community_algorithm(graph, algorithm, seed=COMMUNITY_SEED):
+    """Run a community algorithm measuring its runtime (worker of
+    diogenetGraph.iter_community_comparison)
+
+    :return: The algorithm, membership, modularity and runtime in seconds
+    :rtype: :py:class:`tuple`
+    """
+    with seeded_random_number_generator(seed):
+        start = time.perf_counter()
+        clustering = run_community_algorithm(graph, algorithm)
+        runtime = time.perf_counter() - start
+    return (algorithm, clustering.membership, clustering.modularity, runtime)
@@ -7,6 +7,7 @@ import pandas as pd
 import io
 import requests
 import os
+import threading
 
 #  Not needed. Data is called from the class. .
 #  from . import network_graph
@@ -16,6 +17,62 @@ import os
 
 import data_analysis_module.network_graph as ng
 
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data'))
+DATASET_LIST_FILE = "datasetList.csv"
+
+# Parsed csv files shared by the whole process: {absolute path: (mtime, frame)}
+_dataset_cache = {}
+_dataset_cache_lock = threading.Lock()
+# File name of every (dataset, type) pair, by modification time of datasetList.csv
+_dataset_file_names = {}
+
+
+def get_data_path(entity_name):
+    """Return the absolute path of a file in the local data directory.
+
+    :param str entity_name: The name of the entity file (csv file name).
+    :return: The absolute path of the file.
+    :rtype: :py:class:`str`
+    """
+    return os.path.join(DATA_DIR, entity_name)
+
+def read_csv_cached(file_path):
+    """Parse a csv file once per process and return the shared frame.
+
+    The file is parsed again only when its modification time changes. The
+    returned frame is a copy of the cached one, so callers may modify it
+    freely without affecting later reads.
+
+    :param str file_path: Path of the csv file.
+    :return: A Data Frame filled with the file's data.
+    :rtype: :py:class:`pd.DataFrame`
+    """
+    file_path = os.path.abspath(file_path)
+    mtime = os.path.getmtime(file_path)
+    with _dataset_cache_lock:
+        cached = _dataset_cache.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        df = cached[1]
+    else:
+        df = pd.read_csv(file_path, delimiter=",", header=0)
+        with _dataset_cache_lock:
+            _dataset_cache[file_path] = (mtime, df)
+    return df.copy()
+
+def get_data_entity_mtime(entity_name):
+    """Retrieve the modification time of a file in the local data directory.
+
+    :param str entity_name: The name of the entity file (csv file name).
+    :return: The modification time of the file.
+    :rtype: :py:class:`float`
+    """
+    return os.path.getmtime(get_data_path(entity_name))
+
+def clear_dataset_cache():
+    """Drop every parsed csv file so the next access reads them from disk.
+    """
+    with _dataset_cache_lock:
+        _dataset_cache.clear()
 
 def get_data_entity_local(entity_name):
     """Retrieve a dataset with Complex Network's data.
@@ -24,9 +81,7 @@ def get_data_entity_local(entity_name):
     :return: A Data Frame filled with the entity's data.
     :rtype: :py:class:`pd.DataFrame`
     """
-    df = None
-    df = pd.read_csv(os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data', entity_name)), delimiter=",", header=0)
-    return df
+    return read_csv_cached(get_data_path(entity_name))
 
 def get_data_entity_database(entity_name, method):
     """Retrieve a dataset with Complex Network's data.
@@ -53,27 +108,45 @@ def get_data_entity_url(entity_name):
 
     return df
 
-def get_nodes_dataset(input = 'diogenes'):
-    """Retrieve a Network's nodes dataset.
+def get_dataset_list():
+    """Retrieve the list of datasets available in /data.
 
-    :param str input: The name of the entity file (ie.: 'iamblichus', 'diogenes',...).
-    :return: A Data Frame filled with the entity's data.
+    :return: A Data Frame with name, path and type of every dataset file.
     :rtype: :py:class:`pd.DataFrame`
     """
+    return read_csv_cached(get_data_path(DATASET_LIST_FILE))
 
-    # lista de datasets disponibles en /data
-    dataset_list_df = pd.read_csv(os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data', "datasetList.csv")))
+def get_dataset_file_name(input, type):
+    """Retrieve the file name of a Network's dataset.
 
-    # condiciones para el path name 
-    m1 = dataset_list_df['name'] == str(input)
-    m2 = dataset_list_df['type'] == 'nodes'
+    :param str input: The name of the entity file (ie.: 'iamblichus', 'diogenes',...).
+    :param str type: The type of the dataset file ('nodes' or 'edges').
+    :return: The csv file name registered in datasetList.csv.
+    :rtype: :py:class:`str`
+    """
+    mtime = get_data_entity_mtime(DATASET_LIST_FILE)
+    file_names = _dataset_file_names.get(mtime)
+    if file_names is None:
+        dataset_list = get_dataset_list().drop_duplicates(['name', 'type'])
+        file_names = dict(
+            zip(
+                zip(dataset_list['name'].astype(str), dataset_list['type']),
+                dataset_list['path'].astype(str),
+            )
+        )
+        _dataset_file_names.clear()
+        _dataset_file_names[mtime] = file_names
+
+    return file_names[(str(input), type)]
 
-    # leyendo el archivo de datos de nodos
-    nodes_path_name = str(list(dataset_list_df[m1&m2]['path'])[0])
-    nodes_path_dir = os.path.abspath(os.path.dirname(nodes_path_name))
-    nodes_dataset = pd.read_csv(os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data', nodes_path_name)), delimiter=",", header=0)
+def get_nodes_dataset(input = 'diogenes'):
+    """Retrieve a Network's nodes dataset.
 
-    return nodes_dataset
+    :param str input: The name of the entity file (ie.: 'iamblichus', 'diogenes',...).
+    :return: A Data Frame filled with the entity's data.
+    :rtype: :py:class:`pd.DataFrame`
+    """
+    return get_data_entity_local(get_dataset_file_name(input, 'nodes'))
 
 def get_edges_dataset(input = 'diogenes'):
     """Retrieve a Network's edges dataset.
@@ -82,20 +155,7 @@ def get_edges_dataset(input = 'diogenes'):
     :return: A Data Frame filled with the entity's data.
     :rtype: :py:class:`pd.DataFrame`
     """
-
-    # lista de datasets disponibles en /data
-    dataset_list_path = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data', "datasetList.csv"))
-    dataset_list = pd.read_csv(dataset_list_path)
-
-    # condiciones para el path name 
-    m1 = dataset_list['name'] == str(input)
-    m3 = dataset_list['type'] == 'edges'
-
-    # leyendo el archivo de datos de edges
-    edges_path_name = str(list(dataset_list[m1&m3]['path'])[0])
-    edges_dataset = pd.read_csv(os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'data', edges_path_name)), delimiter=",", header=0)
-
-    return edges_dataset
+    return get_data_entity_local(get_dataset_file_name(input, 'edges'))
 
 
 #travel_edges = pd.read_csv("travel_edges_graph.csv", delimiter=",")
@@ -0,0 +1,137 @@
+"""Module to keep the rendered graphs (pyvis and folium pages, vis.js
+    payloads) in memory.
+    They are stored by render key (see diogenetGraph.get_render_key) and
+    served to the iframes of the apps through routes of the Flask server,
+    so identical requests reuse the graph already rendered.
+
+.. platform:: Unix, Windows, Mac
+"""
+import gzip
+import json
+import os
+import tempfile
+
+from data_analysis_module.cache import LRUCache
+
+# Maximum size in bytes of the pages and payloads kept in memory
+RENDERED_HTML_CACHE_SIZE = 64 * 1024 * 1024
+
+# Render keys include the renderer, so pages and payloads never collide
+_rendered_html = LRUCache(RENDERED_HTML_CACHE_SIZE, getsizeof=len)
+
+
+def has_rendered_html(key):
+    """Tell if the page of a render key is stored
+
+    :param str key: Render key
+    :rtype: :py:class:`bool`
+    """
+    return key in _rendered_html
+
+
+def get_rendered_html(key):
+    """Retrieve the page of a render key
+
+    :param str key: Render key
+    :return: The page encoded in utf-8 or None if it is not stored
+    :rtype: :py:class:`bytes`
+    """
+    return _rendered_html.get(key)
+
+
+def put_rendered_html(key, rendered_html):
+    """Store the page of a render key
+
+    :param str key: Render key
+    :param str rendered_html: Full html page
+    """
+    _rendered_html.put(key, rendered_html.encode("utf-8"))
+
+
+def pyvis_to_html(pvis_graph):
+    """Render a pyvis network as a full html page without keeping any file
+
+    :param pvis_graph: pyvis Network
+    :rtype: :py:class:`str`
+    """
+    if hasattr(pvis_graph, "generate_html"):
+        return pvis_graph.generate_html()
+    # Older pyvis versions only render to a file
+    with tempfile.TemporaryDirectory() as temp_dir:
+        full_filename = os.path.join(temp_dir, "graph.html")
+        pvis_graph.write_html(full_filename)
+        with open(full_filename, encoding="utf-8") as html_file:
+            return html_file.read()
+
+
+def render_pyvis(graph, **render_params):
+    """Render the current subgraph of graph with pyvis, unless an identical
+       page is already stored
+
+    :param graph: diogenetGraph with the filters already set
+    :param render_params: Keyword arguments of diogenetGraph.get_pyvis
+    :return: The render key of the page, None if there is nothing to render
+    :rtype: :py:class:`str`
+    """
+    key = graph.get_render_key("pyvis", render_params)
+    if not has_rendered_html(key):
+        pvis_graph = graph.get_pyvis(**render_params)
+        if not pvis_graph:
+            return None
+        put_rendered_html(key, pyvis_to_html(pvis_graph))
+    else:
+        graph.record_layout(render_params.get("layout", "fr"))
+    return key
+
+
+def has_vis_payload(key):
+    """Tell if the vis.js payload of a render key is stored
+
+    :param str key: Render key
+    :rtype: :py:class:`bool`
+    """
+    return key in _rendered_html
+
+
+def get_vis_payload(key, compressed=True):
+    """Retrieve the vis.js payload of a render key as json
+
+    :param str key: Render key
+    :param bool compressed: Return the json gzipped, as it is stored
+    :return: The payload or None if it is not stored
+    :rtype: :py:class:`bytes`
+    """
+    payload = _rendered_html.get(key)
+    if payload is not None and not compressed:
+        payload = gzip.decompress(payload)
+    return payload
+
+
+def put_vis_payload(key, payload):
+    """Store the vis.js payload of a render key
+
+    :param str key: Render key
+    :param dict payload: Payload created by diogenetGraph.get_vis_payload
+    """
+    payload = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    _rendered_html.put(key, gzip.compress(payload))
+
+
+def render_vis_payload(graph, **render_params):
+    """Create the vis.js payload of the current subgraph of graph, unless an
+       identical payload is already stored
+
+    :param graph: diogenetGraph with the filters already set
+    :param render_params: Keyword arguments of diogenetGraph.get_vis_payload
+    :return: The render key of the payload, None if there is nothing to render
+    :rtype: :py:class:`str`
+    """
+    key = graph.get_render_key("visjs", render_params)
+    if not has_vis_payload(key):
+        payload = graph.get_vis_payload(**render_params)
+        if not payload:
+            return None
+        put_vis_payload(key, payload)
+    else:
+        graph.record_layout(render_params.get("layout", "fr"))
+    return key
@@ -12,14 +12,29 @@ import igraph
 import pyvis
 import json
 import copy
+import hashlib
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 import data_analysis_module.data_access as da
+from data_analysis_module.cache import LRUCache
+from data_analysis_module.community_worker import (
+    CLUSTERING_COMMUNITY_ALGORITHMS,
+    COMMUNITY_SEED,
+    DENDROGRAM_COMMUNITY_ALGORITHMS,
+    run_community_algorithm,
+    seeded_random_number_generator,
+    time_community_algorithm,
+)
 import random
 import os
-import tempfile
 import pathlib
+import threading
+import multiprocessing
+import atexit
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import networkx as nx
 
 
@@ -36,6 +51,14 @@ GRAPH_TYPE = "communities"
 TRAVELS_BLACK_LIST_FILE = "travels_blacklist.csv"
 LOCATIONS_DATA_FILE = "locations_data.csv"
 DATASET_NAME = "diogenes"
+
+# Default views of the apps, precomputed by warm_up
+DEFAULT_EDGES_FILTER = "is teacher of"
+DEFAULT_EGOS = {"diogenes": "Plato", "iamblichus": "Pythagoras"}
+DEFAULT_LOCAL_ORDER = 2
+DEFAULT_COMM_ALG = "community_edge_betweenness"
+DEFAULT_LAYOUT = "fr"
+WARM_UP_GRAPH_TYPES = ("global", "local", "communities", "map")
 # These are the files already processed. Must be created "on the fly"
 TRAVEL_EDGES_FILE = "travel_edges_graph.csv"
 ALL_PLACES_FILE = "all_places_graph.csv"
@@ -66,6 +89,7 @@ VIRIDIS_COLORMAP = [
     (180, 222, 44),
     (253, 231, 37),
 ]
+VIRIDIS_HEX = np.array(["#%02x%02x%02x" % rgb for rgb in VIRIDIS_COLORMAP])
 
 EDGES_COLORS = [
     "#fff100",
@@ -86,15 +110,730 @@ arrow_valid_filters = [
     "studied the work of",
 ]
 
+# Number of filtered subgraphs kept in memory by each base graph
+SUBGRAPH_CACHE_SIZE = 64
+# Number of centrality results kept in memory by each base graph
+CENTRALITY_CACHE_SIZE = 256
+
+# Centralities of an igraph graph by name
+CENTRALITY_FUNCTIONS = {
+    "degree": lambda graph: graph.degree(),
+    "betweenness": lambda graph: graph.betweenness(),
+    "closeness": lambda graph: graph.closeness(),
+    "eigenvector": lambda graph: graph.evcent(),
+}
+
+# Betweenness calculation: "exact", "sampled" (from the shortest paths of a
+# sample of source vertices), "cutoff" (only paths of at most
+# BETWEENNESS_CUTOFF hops) or "auto" (exact up to
+# BETWEENNESS_EXACT_MAX_VERTICES vertices, sampled above)
+BETWEENNESS_MODE = "auto"
+BETWEENNESS_EXACT_MAX_VERTICES = 5000
+BETWEENNESS_SAMPLES = 256
+BETWEENNESS_SEED = 1234
+BETWEENNESS_CUTOFF = 4
+
+# Seed of the random number generator used by the layouts
+LAYOUT_SEED = 1234
+# Number of layouts kept in memory
+LAYOUT_CACHE_SIZE = 256
+# Directory where layouts are also saved (.npy files), None to keep them only in memory
+LAYOUT_CACHE_DIR = None
+# Layouts that can be refined from the positions of a previous subgraph
+WARM_START_LAYOUTS = ("fr", "kk")
+# Iterations of the refinement (for kk, per vertex)
+WARM_START_FR_ITERATIONS = 50
+WARM_START_KK_ITERATIONS = 5
+# Number of sessions whose warm start positions are kept in memory
+WARM_START_SESSIONS = 1024
+
+# Number of community detection results kept in memory
+COMMUNITY_CACHE_SIZE = 64
+# Number of structural analyses (see SubgraphStructure) kept in memory
+STRUCTURE_CACHE_SIZE = 64
+# Number of hop distance indexes (see HopDistanceIndex) kept in memory
+DISTANCE_INDEX_CACHE_SIZE = 16
+# Directory where distance indexes are also saved (.npy files, memory mapped
+# when loaded), None to keep them only in memory
+DISTANCE_INDEX_DIR = None
+# Largest graph with a distance index (the index takes vertices squared bytes)
+DISTANCE_INDEX_MAX_VERTICES = 10000
+# Rows of the index calculated at once
+DISTANCE_INDEX_BLOCK_SIZE = 256
+
+
+# Base graphs shared by every request: {key: (data files mtimes, graph)}
+_graph_registry = {}
+_graph_registry_lock = threading.Lock()
+
+# Worker processes of the community comparisons, started on first use and
+# kept for the life of the process: {number of processes: ProcessPoolExecutor}
+_community_pools = {}
+_community_pools_lock = threading.Lock()
+
+# Layouts shared by every graph: {(fingerprint, layout name, seed): coordinates}
+_layout_cache = LRUCache(LAYOUT_CACHE_SIZE)
+# Warm start positions of every session:
+# {(session, graph type, nodes file, edges file): (positions, fingerprints, tokens)}
+_warm_start_states = LRUCache(WARM_START_SESSIONS)
+# Warm started layouts shared by every session: {layout token: coordinates}
+_warm_start_layouts = LRUCache(LAYOUT_CACHE_SIZE)
+# Communities shared by every graph: {(algorithm, fingerprint, seed): (modularity, communities)}
+_community_cache = LRUCache(COMMUNITY_CACHE_SIZE)
+# Structural analyses shared by every graph: {fingerprint: SubgraphStructure}
+_structure_cache = LRUCache(STRUCTURE_CACHE_SIZE)
+# Distance indexes shared by every graph: {fingerprint: HopDistanceIndex}
+_distance_index_cache = LRUCache(DISTANCE_INDEX_CACHE_SIZE)
+
+
+def coordinates_to_lists(values):
+    """Wrap every coordinate in a list, empty for unknown (NaN) coordinates
+
+    :param values: Sequence of coordinates
+    :return: A list of lists with one or zero coordinates each
+    """
+    values = np.asarray(values, dtype=float).tolist()
+    return [[] if np.isnan(value) else [value] for value in values]
+
+
+def get_graph_fingerprint(graph):
+    """Return a hash of the structure of a graph (vertex names and edges)
+
+    :param graph: igraph graph
+    :rtype: :py:class:`str`
+    """
+    digest = hashlib.sha1()
+    digest.update("\0".join(graph.vs["name"]).encode("utf-8"))
+    digest.update(np.array(graph.get_edgelist(), dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def compute_layout(graph, layout_name, seed=LAYOUT_SEED):
+    """Compute a layout of graph
+
+    :param graph: igraph graph
+    :param str layout_name: "kk", "grid_fr", "circle", "sphere" or "fr"
+    :param int seed: Seed of the random number generator
+    :return: An array with the coordinates of every vertex
+    :rtype: :py:class:`np.ndarray`
+    """
+    with seeded_random_number_generator(seed):
+        if layout_name == "kk":
+            layout = graph.layout_kamada_kawai()
+        elif layout_name == "grid_fr":
+            layout = graph.layout_grid()
+        elif layout_name == "circle":
+            layout = graph.layout_circle()
+        elif layout_name == "sphere":
+            layout = graph.layout_sphere()
+        else:
+            layout = graph.layout_fruchterman_reingold()
+    return np.array(layout.coords, dtype=float).reshape(graph.vcount(), layout.dim)
+
+
+def get_layout_file_name(key):
+    fingerprint, layout_name, seed = key
+    return os.path.join(
+        LAYOUT_CACHE_DIR, "{}_{}_{}.npy".format(fingerprint, layout_name, seed)
+    )
+
+
+def get_layout(graph, layout_name, fingerprint=None, seed=LAYOUT_SEED):
+    """Return a layout of graph, computed once per graph structure
+
+    Layouts are kept in memory and, when LAYOUT_CACHE_DIR is set, on disk.
+    The returned array is shared and read only.
+
+    :param graph: igraph graph
+    :param str layout_name: "kk", "grid_fr", "circle", "sphere" or "fr"
+    :param fingerprint: get_graph_fingerprint of graph, if already known
+    :param int seed: Seed of the random number generator
+    :return: An array with the coordinates of every vertex
+    :rtype: :py:class:`np.ndarray`
+    """
+    if fingerprint is None:
+        fingerprint = get_graph_fingerprint(graph)
+    key = (fingerprint, layout_name, seed)
+    coordinates = _layout_cache.get(key)
+    if coordinates is None:
+        if LAYOUT_CACHE_DIR and os.path.exists(get_layout_file_name(key)):
+            coordinates = np.load(get_layout_file_name(key))
+        else:
+            coordinates = compute_layout(graph, layout_name, seed)
+            if LAYOUT_CACHE_DIR:
+                os.makedirs(LAYOUT_CACHE_DIR, exist_ok=True)
+                temp_file_name = get_layout_file_name(key) + ".{}.tmp".format(os.getpid())
+                with open(temp_file_name, "wb") as layout_file:
+                    np.save(layout_file, coordinates)
+                os.replace(temp_file_name, get_layout_file_name(key))
+        coordinates.flags.writeable = False
+        _layout_cache.put(key, coordinates)
+    return coordinates
+
+
+def get_layout_name(layout):
+    """Return the name of the layout set_graph_layout uses for layout
+
+    :param str layout: Layout requested ("fr" is used for unknown names)
+    :rtype: :py:class:`str`
+    """
+    return layout if layout in ("kk", "grid_fr", "circle", "sphere") else "fr"
+
+
+def get_warm_start_seed(graph, positions, seed=LAYOUT_SEED):
+    """Return initial coordinates for the vertices of graph from the positions
+    they had in previous layouts
+
+    Vertices without a previous position are placed at the mean position of
+    their placed neighbours or, when there is none, randomly around the
+    placed vertices.
+
+    :param graph: igraph graph
+    :param dict positions: {vertex name: (x, y)} of the vertices already placed
+    :param int seed: Seed of the random number generator
+    :return: An array with the coordinates of every vertex
+    :rtype: :py:class:`np.ndarray`
+    """
+    coordinates = np.full((graph.vcount(), 2), np.nan)
+    for index, name in enumerate(graph.vs["name"]):
+        if name in positions:
+            coordinates[index] = positions[name]
+    placed = ~np.isnan(coordinates[:, 0])
+
+    center = coordinates[placed].mean(axis=0)
+    spread = coordinates[placed].std(axis=0).max() or 1.0
+    rng = np.random.default_rng(seed)
+    for index in np.flatnonzero(~placed):
+        neighbours = [
+            neighbour for neighbour in graph.neighbors(index) if placed[neighbour]
+        ]
+        if neighbours:
+            # A little jitter so neighbours of the same vertex do not overlap
+            coordinates[index] = coordinates[neighbours].mean(axis=0) + rng.normal(
+                scale=spread * 0.05, size=2
+            )
+        else:
+            coordinates[index] = center + rng.uniform(-spread, spread, size=2)
+    return coordinates
+
+
+def refine_layout(graph, layout_name, seed_coordinates, seed=LAYOUT_SEED):
+    """Run a few iterations of a layout starting from given coordinates
+
+    :param graph: igraph graph
+    :param str layout_name: "kk" or "fr"
+    :param seed_coordinates: Array with the initial coordinates of every vertex
+    :param int seed: Seed of the random number generator
+    :return: An array with the coordinates of every vertex
+    :rtype: :py:class:`np.ndarray`
+    """
+    with seeded_random_number_generator(seed):
+        if layout_name == "kk":
+            layout = graph.layout_kamada_kawai(
+                seed=seed_coordinates.tolist(),
+                maxiter=WARM_START_KK_ITERATIONS * graph.vcount(),
+            )
+        else:
+            layout = graph.layout_fruchterman_reingold(
+                seed=seed_coordinates.tolist(), niter=WARM_START_FR_ITERATIONS
+            )
+    return np.array(layout.coords, dtype=float).reshape(graph.vcount(), layout.dim)
+
+
+def get_community_pool(processes=None):
+    """Return the process pool running the community comparisons
+
+    Workers start from a fresh interpreter (forking a server process with
+    other threads running may copy locks they hold). Starting one imports
+    the main module again, so the pool is created once and reused.
+
+    :param processes: Number of worker processes, by default the number of
+    CPUs
+    :rtype: :py:class:`ProcessPoolExecutor`
+    """
+    with _community_pools_lock:
+        pool = _community_pools.get(processes)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            )
+            _community_pools[processes] = pool
+        return pool
+
+
+def discard_community_pool(processes=None):
+    """Forget a broken process pool so get_community_pool starts a new one
+
+    :param processes: Number of worker processes of the pool
+    """
+    with _community_pools_lock:
+        pool = _community_pools.pop(processes, None)
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+@atexit.register
+def shutdown_community_pools():
+    """Stop the worker processes of every community comparison pool
+    """
+    with _community_pools_lock:
+        pools = list(_community_pools.values())
+        _community_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False)
+
+
+def get_interpolated_indexes(values, r1_min, r1_max, r2_min=0, r2_max=9):
+    """Interpolate every value from range [r1_min, r1_max] to an integer of
+       [r2_min..r2_max], like diogenetGraph.get_interpolated_index
+
+    :param values: Sequence of values
+    :return: An array with the interpolated indexes
+    :rtype: :py:class:`np.ndarray`
+    """
+    values = np.asarray(values)
+    if r1_max > r1_min:
+        return np.rint(
+            r2_min + ((values - r1_min) / (r1_max - r1_min)) * (r2_max - r2_min)
+        ).astype(int)
+    # Same as get_interpolated_index, every value gets r1_min
+    return np.full(values.shape, r1_min)
+
+
+def get_node_styles(centrality_indexes, min_weight=4, max_weight=6):
+    """Map a centrality vector to viridis colors and node sizes
+
+    :param centrality_indexes: Centrality of every node
+    :param min_weight: Size of the nodes with the lowest centrality
+    :param max_weight: Size of the nodes with the highest centrality
+    :return: Arrays with the hex color and the size of every node
+    :rtype: :py:class:`tuple`
+    """
+    centrality_indexes = np.asarray(centrality_indexes)
+    if centrality_indexes.size == 0:
+        return np.array([], dtype=VIRIDIS_HEX.dtype), np.array([], dtype=int)
+    centrality_min = centrality_indexes.min()
+    centrality_max = centrality_indexes.max()
+    color_indexes = get_interpolated_indexes(
+        centrality_indexes, centrality_min, centrality_max, 0, len(VIRIDIS_HEX) - 1
+    )
+    colors = VIRIDIS_HEX[np.clip(color_indexes, 0, len(VIRIDIS_HEX) - 1).astype(int)]
+    sizes = get_interpolated_indexes(
+        centrality_indexes, centrality_min, centrality_max, min_weight, max_weight
+    )
+    return colors, sizes
+
+
+@dataclass(frozen=True)
+class SubgraphStructure:
+    """Cut vertices, bridges and components of a graph
+
+    :param cut_vertex_mask: Boolean array telling if each vertex is a cut vertex
+    :param articulation_points: Indexes of the cut vertices
+    :param bridges: Indexes of the edges whose removal disconnects the graph
+    :param biconnected_components: Vertex indexes of each biconnected component
+    :param component_membership: Connected component of each vertex
+    :param component_sizes: Number of vertices of each connected component
+    """
+
+    cut_vertex_mask: np.ndarray
+    articulation_points: list
+    bridges: list
+    biconnected_components: list
+    component_membership: np.ndarray
+    component_sizes: np.ndarray
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Analyze the structure of graph
+
+        :param graph: igraph graph
+        :rtype: :py:class:`SubgraphStructure`
+        """
+        biconnected_components, articulation_points = graph.biconnected_components(
+            return_articulation_points=True
+        )
+        cut_vertex_mask = np.zeros(graph.vcount(), dtype=bool)
+        cut_vertex_mask[articulation_points] = True
+        component_membership = np.array(graph.components().membership, dtype=int)
+        return cls(
+            cut_vertex_mask=cut_vertex_mask,
+            articulation_points=sorted(articulation_points),
+            bridges=graph.bridges(),
+            biconnected_components=[
+                list(vertices) for vertices in biconnected_components
+            ],
+            component_membership=component_membership,
+            component_sizes=np.bincount(component_membership),
+        )
+
 
-GRAPHML_SUFFIX = ".graphml"
+class HopDistanceIndex:
+    """Number of hops between every pair of vertices of a graph, stored as a
+    uint8 matrix
 
+    :param names: Vertex names, in the order of the matrix rows
+    :param distances: Square uint8 array, UNREACHABLE for pairs of vertices
+    in different components
+    """
 
-def get_graphml_temp_file():
-    temp_file_name = next(tempfile._get_candidate_names()) + GRAPHML_SUFFIX
-    full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', 'assets',temp_file_name))
-    #print(full_filename)
-    return full_filename
+    UNREACHABLE = 255
+
+    def __init__(self, names, distances):
+        self.names = names
+        self.distances = distances
+        self.vertex_index = {name: index for index, name in enumerate(names)}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Calculate the hop distances of graph with one breadth first search
+        per vertex, a block of rows at a time
+
+        :param graph: igraph graph
+        :return: The index, None when a distance does not fit in the index
+        (UNREACHABLE hops or more)
+        :rtype: :py:class:`HopDistanceIndex`
+        """
+        vcount = graph.vcount()
+        # python-igraph < 0.10 names it shortest_paths
+        get_distances = getattr(graph, "distances", None) or graph.shortest_paths
+        distances = np.full((vcount, vcount), cls.UNREACHABLE, dtype=np.uint8)
+        for start in range(0, vcount, DISTANCE_INDEX_BLOCK_SIZE):
+            sources = list(range(start, min(start + DISTANCE_INDEX_BLOCK_SIZE, vcount)))
+            block = np.array(get_distances(source=sources), dtype=float)
+            reachable = np.isfinite(block)
+            if reachable.any() and block[reachable].max() >= cls.UNREACHABLE:
+                return None
+            distances[start : start + len(sources)][reachable] = block[reachable]
+        return cls(graph.vs["name"], distances)
+
+    def neighborhood(self, ego, order=1):
+        """Return the vertices at most order hops away from ego
+
+        :param ego: Vertex name
+        :param order: Maximum number of hops
+        :return: The vertex indexes, ascending
+        :rtype: :py:class:`np.ndarray`
+        """
+        # Every distance stored is below UNREACHABLE, larger orders would
+        # also match the unreachable vertices
+        order = min(order, self.UNREACHABLE - 1)
+        return np.flatnonzero(self.distances[self.vertex_index[ego]] <= order)
+
+    def closeness(self):
+        """Return the closeness of every vertex, calculated (like igraph) over
+        the vertices it can reach. NaN for isolated vertices
+
+        :rtype: :py:class:`np.ndarray`
+        """
+        reachable = self.distances != self.UNREACHABLE
+        totals = np.where(reachable, self.distances, 0).sum(axis=1, dtype=np.int64)
+        counts = reachable.sum(axis=1) - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return counts / totals
+
+
+def get_distance_index(graph, fingerprint=None):
+    """Return the hop distance index of graph, calculated once per graph
+    structure
+
+    Indexes are kept in memory and, when DISTANCE_INDEX_DIR is set, on disk,
+    from where they are memory mapped.
+
+    :param graph: igraph graph
+    :param fingerprint: get_graph_fingerprint of graph, if already known
+    :return: The index, None when graph has more than
+    DISTANCE_INDEX_MAX_VERTICES vertices or paths too long for an index
+    :rtype: :py:class:`HopDistanceIndex`
+    """
+    if graph.vcount() > DISTANCE_INDEX_MAX_VERTICES:
+        return None
+    if fingerprint is None:
+        fingerprint = get_graph_fingerprint(graph)
+    distance_index = _distance_index_cache.get(fingerprint)
+    if distance_index is None:
+        file_name = None
+        if DISTANCE_INDEX_DIR:
+            file_name = os.path.join(
+                DISTANCE_INDEX_DIR, "{}_distances.npy".format(fingerprint)
+            )
+        if file_name and os.path.exists(file_name):
+            distance_index = HopDistanceIndex(
+                graph.vs["name"], np.load(file_name, mmap_mode="r")
+            )
+        else:
+            distance_index = HopDistanceIndex.from_graph(graph)
+            if distance_index is None:
+                # Remember that the graph can not be indexed
+                _distance_index_cache.put(fingerprint, False)
+                return None
+            if file_name:
+                os.makedirs(DISTANCE_INDEX_DIR, exist_ok=True)
+                temp_file_name = file_name + ".{}.tmp".format(os.getpid())
+                with open(temp_file_name, "wb") as index_file:
+                    np.save(index_file, distance_index.distances)
+                os.replace(temp_file_name, file_name)
+        _distance_index_cache.put(fingerprint, distance_index)
+    return distance_index or None
+
+
+def get_components_sizes(graph):
+    """Return the size of the connected component of every vertex
+
+    :param graph: igraph graph
+    :rtype: :py:class:`np.ndarray`
+    """
+    membership = np.array(graph.components().membership, dtype=int)
+    if membership.size == 0:
+        return membership
+    return np.bincount(membership)[membership]
+
+
+def get_simple_graph(graph):
+    """Return graph with its parallel edges collapsed into one
+
+    Several travels between the same two places are parallel edges of the map
+    graph, while the centrality tables count every pair of neighbours once.
+
+    :param graph: igraph graph
+    :return: graph itself when it has no parallel edges, otherwise a
+    simplified copy with the same vertices (loops are kept)
+    :rtype: :py:class:`igraph.Graph`
+    """
+    if not any(graph.is_multiple()):
+        return graph
+    simple_graph = graph.copy()
+    simple_graph.simplify(multiple=True, loops=False, combine_edges="first")
+    return simple_graph
+
+
+def centrality_frame(graph, degree, betweenness, closeness, eigenvector, normalized=False):
+    """Create the centrality table of graph from its centrality vectors
+
+    :param graph: igraph graph the centralities were calculated on
+    :param degree: Degree of every vertex
+    :param betweenness: Betweenness of every vertex
+    :param closeness: Closeness of every vertex (igraph, reachable vertices only)
+    :param eigenvector: Eigenvector centrality of every vertex (igraph, scaled)
+    :param normalized: Scale the centralities the way NetworkX does
+    :return: A dataframe indexed by vertex name
+    :rtype: :py:class:`pd.DataFrame`
+    """
+    n = graph.vcount()
+    degree = np.asarray(degree, dtype=float)
+    betweenness = np.asarray(betweenness, dtype=float)
+    closeness = np.asarray(closeness, dtype=float)
+    eigenvector = np.asarray(eigenvector, dtype=float)
+    if normalized:
+        if n > 1:
+            degree = degree / (n - 1)
+        if n > 2:
+            betweenness = betweenness / ((n - 1) * (n - 2) / 2)
+        if n > 1:
+            reachable = get_components_sizes(graph) - 1
+            closeness = np.nan_to_num(closeness) * reachable / (n - 1)
+        norm = np.linalg.norm(eigenvector)
+        if norm > 0:
+            eigenvector = eigenvector / norm
+    return pd.DataFrame(
+        {
+            "Degree": degree,
+            "Betweeness": betweenness,
+            "Closeness": closeness,
+            "Eigenvector": eigenvector,
+        },
+        index=pd.Index(graph.vs["name"], name="Phylosopher"),
+    )
+
+
+def get_source_dependencies(graph, sources):
+    """Accumulate the dependencies of every vertex on the shortest paths
+    starting at each source (Brandes), one breadth first search per source
+
+    :param graph: Undirected igraph graph
+    :param sources: Indexes of the source vertices
+    :return: The sum and the sum of squares of the dependencies of every vertex
+    :rtype: :py:class:`tuple`
+    """
+    vcount = graph.vcount()
+    edges = np.array(graph.get_edgelist(), dtype=np.int64).reshape(-1, 2)
+    tails = np.concatenate([edges[:, 0], edges[:, 1]])
+    heads = np.concatenate([edges[:, 1], edges[:, 0]])
+    total = np.zeros(vcount)
+    squares = np.zeros(vcount)
+    for source in sources:
+        distance = np.full(vcount, -1, dtype=np.int64)
+        distance[source] = 0
+        paths = np.zeros(vcount)
+        paths[source] = 1
+        # Edges of the shortest paths dag, by level of their tail
+        levels = []
+        while True:
+            head_distance = distance[heads]
+            level_edges = (distance[tails] == len(levels)) & (
+                (head_distance == -1) | (head_distance == len(levels) + 1)
+            )
+            if not level_edges.any():
+                break
+            distance[heads[level_edges]] = len(levels) + 1
+            np.add.at(paths, heads[level_edges], paths[tails[level_edges]])
+            levels.append(level_edges)
+        dependency = np.zeros(vcount)
+        for level_edges in reversed(levels):
+            level_tails = tails[level_edges]
+            level_heads = heads[level_edges]
+            np.add.at(
+                dependency,
+                level_tails,
+                paths[level_tails] / paths[level_heads] * (1 + dependency[level_heads]),
+            )
+        dependency[source] = 0
+        total += dependency
+        squares += dependency ** 2
+    return total, squares
+
+
+def sampled_betweenness(graph, samples=BETWEENNESS_SAMPLES, seed=BETWEENNESS_SEED):
+    """Estimate the betweenness of every vertex from the shortest paths
+    starting at a random sample of vertices
+
+    :param graph: Undirected igraph graph
+    :param samples: Number of source vertices
+    :param seed: Seed of the random number generator choosing the sources
+    :return: The estimated betweenness and its standard error, for every vertex
+    :rtype: :py:class:`tuple`
+    """
+    vcount = graph.vcount()
+    if vcount == 0:
+        return np.zeros(0), np.zeros(0)
+    rng = np.random.default_rng(seed)
+    sources = rng.choice(vcount, size=min(samples, vcount), replace=False)
+    total, squares = get_source_dependencies(graph, sources)
+    mean = total / len(sources)
+    variance = np.maximum(squares / len(sources) - mean ** 2, 0)
+    # Sources are sampled without replacement, so a full sample has no error
+    correction = (vcount - len(sources)) / (vcount - 1) if vcount > 1 else 0.0
+    # Undirected paths are found from both ends, hence the half
+    betweenness = vcount / 2 * mean
+    error = vcount / 2 * np.sqrt(variance / len(sources) * correction)
+    return betweenness, error
+
+
+def get_betweenness_mode(graph, mode=BETWEENNESS_MODE):
+    """Return the betweenness calculation used for graph, resolving "auto"
+
+    :param graph: igraph graph
+    :param str mode: "exact", "sampled", "cutoff" or "auto"
+    :rtype: :py:class:`str`
+    """
+    if mode == "auto":
+        if graph.vcount() <= BETWEENNESS_EXACT_MAX_VERTICES:
+            return "exact"
+        return "sampled"
+    if mode not in ("exact", "sampled", "cutoff"):
+        raise ValueError("Unknown betweenness mode: {}".format(mode))
+    return mode
+
+
+def compute_betweenness(
+    graph,
+    mode=BETWEENNESS_MODE,
+    samples=BETWEENNESS_SAMPLES,
+    seed=BETWEENNESS_SEED,
+    cutoff=BETWEENNESS_CUTOFF,
+):
+    """Calculate the betweenness of graph, exactly or approximately
+
+    :param graph: igraph graph
+    :param str mode: "exact", "sampled", "cutoff" or "auto", see BETWEENNESS_MODE
+    :param samples: Number of source vertices of the sampled mode
+    :param seed: Seed choosing the sources of the sampled mode
+    :param cutoff: Maximum length of the paths counted by the cutoff mode
+    :return: The betweenness and the standard error of every vertex (None
+    for the cutoff mode)
+    :rtype: :py:class:`tuple`
+    """
+    mode = get_betweenness_mode(graph, mode)
+    if mode == "exact":
+        return CENTRALITY_FUNCTIONS["betweenness"](graph), [0.0] * graph.vcount()
+    if mode == "cutoff":
+        return graph.betweenness(cutoff=cutoff), None
+    betweenness, error = sampled_betweenness(graph, samples, seed)
+    return betweenness.tolist(), error.tolist()
+
+
+def compute_centrality_table(
+    graph,
+    normalized=False,
+    betweenness_mode=BETWEENNESS_MODE,
+    betweenness_samples=BETWEENNESS_SAMPLES,
+    betweenness_seed=BETWEENNESS_SEED,
+    betweenness_cutoff=BETWEENNESS_CUTOFF,
+):
+    """Calculate the centrality table of graph
+
+    :param graph: igraph graph, parallel edges are counted once
+    :param normalized: Scale the centralities the way NetworkX does
+    :param betweenness_mode: Betweenness calculation, see compute_betweenness
+    :param betweenness_samples: Sources of the sampled betweenness
+    :param betweenness_seed: Seed of the sampled betweenness
+    :param betweenness_cutoff: Path length limit of the cutoff betweenness
+    :return: A dataframe indexed by vertex name with the columns Degree,
+    Betweeness, Closeness and Eigenvector
+    :rtype: :py:class:`pd.DataFrame`
+    """
+    graph = get_simple_graph(graph)
+    betweenness, _ = compute_betweenness(
+        graph,
+        betweenness_mode,
+        betweenness_samples,
+        betweenness_seed,
+        betweenness_cutoff,
+    )
+    return centrality_frame(
+        graph,
+        CENTRALITY_FUNCTIONS["degree"](graph),
+        betweenness,
+        CENTRALITY_FUNCTIONS["closeness"](graph),
+        CENTRALITY_FUNCTIONS["eigenvector"](graph),
+        normalized,
+    )
+
+
+def networkx_centrality_frame(graph):
+    """Create the (normalized) centrality table of graph with NetworkX
+
+    Slow, intended only to cross-check centrality_frame.
+
+    :param graph: igraph graph, parallel edges are counted once
+    :return: A dataframe indexed by vertex name
+    :rtype: :py:class:`pd.DataFrame`
+    """
+    networkx_graph = nx.Graph(get_simple_graph(graph).to_networkx())
+    return pd.DataFrame(
+        {
+            "Degree": nx.degree_centrality(networkx_graph),
+            "Betweeness": nx.betweenness_centrality(networkx_graph),
+            "Closeness": nx.closeness_centrality(networkx_graph),
+            "Eigenvector": nx.eigenvector_centrality(networkx_graph),
+        }
+    ).set_index(pd.Index(graph.vs["name"], name="Phylosopher"))
+
+
+def freeman_centralization(values, theoretical_max):
+    """Return the Freeman centralization of a centrality: the sum of the
+    differences between the maximum and each vertex value, over the largest
+    sum possible in a graph of the same size
+
+    :param values: Centrality of each vertex
+    :param theoretical_max: Largest sum possible for the centrality
+    :return: The centralization, NaN when the theoretical maximum is 0
+    :rtype: :py:class:`float`
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0 or theoretical_max == 0:
+        return float("nan")
+    return float((values.max() - values).sum() / theoretical_max)
 
 
 @dataclass
@@ -106,22 +845,41 @@ class diogenetGraph:
     edges_file = None
     locations_file = None
     blacklist_file = None
+    data_mtimes = None
     current_edges = None
 
     nodes_raw_data = None
     edges_raw_data = None
     location_raw_data = None
+    location_index = None
     blacklist_raw_data = None
     igraph_graph = None
     igraph_subgraph = None
-    networkx_subgraph = None
+    _networkx_subgraph = None
+    _networkx_subgraph_key = None
     igraph_localgraph = None
+    edge_index_table = None
+    subgraph_cache = None
+    subgraph_key = None
+    subgraph_fingerprint = None
+    centrality_cache = None
 
     phylosophers_known_origin = None
     multi_origin_phylosophers = None
 
     graph_layout = None
     graph_layout_name = "None"
+    layout_warm_start = False
+    use_distance_index = False
+    betweenness_mode = BETWEENNESS_MODE
+    betweenness_samples = BETWEENNESS_SAMPLES
+    betweenness_seed = BETWEENNESS_SEED
+    betweenness_cutoff = BETWEENNESS_CUTOFF
+    betweenness_error = None
+    layout_positions = None
+    layout_fingerprints = None
+    layout_tokens = None
+    layout_session = None
     Xn = []
     Yn = []
 
@@ -151,8 +909,8 @@ class diogenetGraph:
     not_located_nodes = None
 
     # This is used only when local graph is plotted
-    local_phylosopher = None
-    local_order = None
+    _local_phylosopher = None
+    _local_order = None
 
     # This is used only to create the communities
     comm_alg = None
@@ -182,17 +940,52 @@ class diogenetGraph:
         :param edges_file: File with full list of edges (.csv)
         :param locations_file: File with list of nodees/localization (.csv).
         :param blacklist_file: File with list of blacklisted places (.csv)
+        :param data_mtimes: Modification times of the data files the graph was
+        built from (set by get_graph)
         :param vertex_filter: Array with the vertex that will  be used to
         create the subgraph
 
         :param nodes_raw_data: Raw data for nodes
         :param edges_raw_data: Raw data for edges
         :param location_raw_data: Raw data for locations
+        :param location_index: Latitude and longitude of every location, indexed by name
         :param blacklist_raw_data: Raw data for blacklisted places
 
         :param igraph_graph: Python igraph graph object
         :param igraph_subgraph: Python igraph sub-graph object
         :param igraph_localgraph: Python igraph local graph object
+        :param edge_index_table: Indexes of the igraph_graph edges of every
+        edge name (relation or traveler)
+        :param subgraph_cache: Subgraphs already created, keyed by the edges
+        filter and the local phylosopher and order
+        :param subgraph_key: Key of igraph_subgraph in subgraph_cache, None
+        when igraph_subgraph must be created again
+        :param subgraph_fingerprint: Hash of the structure of igraph_subgraph
+        :param centrality_cache: Centralities already calculated, keyed by
+        the subgraph key and the centrality name
+        :param betweenness_mode: "exact", "sampled", "cutoff" or "auto",
+        see BETWEENNESS_MODE
+        :param betweenness_samples: Number of source vertices of the sampled
+        betweenness
+        :param betweenness_seed: Seed choosing the sources of the sampled
+        betweenness
+        :param betweenness_cutoff: Maximum length of the paths counted by the
+        cutoff betweenness
+        :param betweenness_error: Standard error of the last betweenness
+        calculated for each vertex, None when it is not known (cutoff)
+        :param use_distance_index: Find ego networks and closeness of the
+        filtered subgraph from its hop distance index (see HopDistanceIndex)
+        instead of traversing it, when it is not too large for an index
+        :param layout_warm_start: Refine the fr and kk layouts from the
+        positions the vertices had in the previous subgraph instead of
+        starting from random positions
+        :param layout_positions: Position of every vertex of the last subgraph
+        placed by each layout in this view or session (see set_layout_session), {layout name: {vertex name: (x, y)}}
+        :param layout_fingerprints: Fingerprint of the last subgraph placed
+        by each layout
+        :param layout_tokens: Token of the last layout of each layout name
+        (see get_warm_start_token)
+        :param layout_session: Session whose warm start positions this view uses
 
         :param phylosophers_known_origin: Data for phylosophers and their origin
         :param multi_origin_phylosophers: List of phylosophers with more than one
@@ -242,6 +1035,56 @@ class diogenetGraph:
         self.create_subgraph()
         self.tabulate_subgraph_data()
 
+    def get_view(self):
+        """Return a cheap per-request copy of the graph
+
+        Raw data, processed data and igraph objects are shared with this graph
+        and must not be modified in place. Request state (edges filter, local
+        phylosopher, layout and plot attributes) belongs to the copy.
+        """
+        view = copy.copy(self)
+        view.edges_filter = []
+        # Mutable request state must not be shared with the other views
+        view.layout_positions = {}
+        view.layout_fingerprints = {}
+        view.layout_tokens = {}
+        return view
+
+    @property
+    def local_phylosopher(self):
+        return self._local_phylosopher
+
+    @local_phylosopher.setter
+    def local_phylosopher(self, local_phylosopher):
+        if local_phylosopher != self._local_phylosopher:
+            self.invalidate_subgraph()
+        self._local_phylosopher = local_phylosopher
+
+    @property
+    def local_order(self):
+        return self._local_order
+
+    @local_order.setter
+    def local_order(self, local_order):
+        if local_order != self._local_order:
+            self.invalidate_subgraph()
+        self._local_order = local_order
+
+    @property
+    def networkx_subgraph(self):
+        """NetworkX copy of the current subgraph, created on first use
+        """
+        actual_graph = self.get_current_subgraph()
+        if actual_graph is None:
+            return None
+        if (
+            self._networkx_subgraph is None
+            or self._networkx_subgraph_key != self.subgraph_key
+        ):
+            self._networkx_subgraph = nx.DiGraph(actual_graph.to_networkx())
+            self._networkx_subgraph_key = self.subgraph_key
+        return self._networkx_subgraph
+
     def know_locations(self):
         """Create parameters for the class graph
 
@@ -261,6 +1104,18 @@ class diogenetGraph:
 
         """
         self.location_raw_data = da.get_data_entity_local(self.locations_file)
+        self.location_index = self.location_raw_data.drop_duplicates(
+            "name"
+        ).set_index("name")[["lat", "lon"]]
+
+    def get_coordinates(self, names):
+        """Resolve the coordinates of several locations at once
+        :param names: Sequence of location names
+        :return: A Data Frame with "lat" and "lon" columns aligned with names
+        (NaN for unknown locations)
+        :rtype: :py:class:`pd.DataFrame`
+        """
+        return self.location_index.reindex(pd.Index(names))
 
     def set_nodes(self):
         """Retrieve and store nodes data in the graph object
@@ -400,64 +1255,34 @@ class diogenetGraph:
 
         """
 
-        traveler_origin = []
-        lat_source = []
-        lon_source = []
-        lat_target = []
-        lon_target = []
-
-        multi_origin = []  # Phylosopher with more than one origin city
         Source = []
         Target = []
         Relation = []
 
         if self.graph_type == "map":
-            for idx, cell in enumerate(self.travels_graph_data.Source):
-                current_origin = pd.Series.to_list(
-                    self.phylosophers_known_origin.origin[
-                        self.phylosophers_known_origin.name == cell
-                    ]
-                )
-                current_destiny = self.travels_graph_data.Target[idx]
-                current_origin = current_origin[0]
-                if len(current_origin) > 1:
-                    # If the traveler shows multiple origins by default the
-                    multi_origin.append(cell)
-                traveler_origin.append(current_origin)
-                current_origin = "".join(current_origin)
-                self.multi_origin_phylosophers = multi_origin
-                lat_source.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lat[
-                            self.location_raw_data.name.isin([current_origin])
-                        ]
-                    )
-                )
-                lon_source.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lon[
-                            self.location_raw_data.name.isin([current_origin])
-                        ]
-                    )
-                )
-                lat_target.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lat[
-                            self.location_raw_data.name.isin([current_destiny])
-                        ]
-                    )
-                )
-                lon_target.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lon[
-                            self.location_raw_data.name.isin([current_destiny])
-                        ]
-                    )
-                )
+            # Every traveler leaves from its first known origin. Phylosophers
+            # with more than one origin city are reported in multi_origin_phylosophers
+            origins = self.phylosophers_known_origin.groupby("name", sort=False)[
+                "origin"
+            ]
+            travels = self.travels_graph_data.assign(
+                origin=self.travels_graph_data.Source.map(origins.first()),
+                multi_origin=self.travels_graph_data.Source.map(origins.size()) > 1,
+            )
+            self.multi_origin_phylosophers = pd.Series.to_list(
+                travels.Source[travels.multi_origin].drop_duplicates()
+            )
 
-            source = traveler_origin
-            target = pd.Series.to_list(self.travels_graph_data.Target)
-            name = pd.Series.to_list(self.travels_graph_data.Source)
+            source_coordinates = self.get_coordinates(travels.origin)
+            target_coordinates = self.get_coordinates(travels.Target)
+            lat_source = coordinates_to_lists(source_coordinates.lat)
+            lon_source = coordinates_to_lists(source_coordinates.lon)
+            lat_target = coordinates_to_lists(target_coordinates.lat)
+            lon_target = coordinates_to_lists(target_coordinates.lon)
+
+            source = pd.Series.to_list(travels.origin)
+            target = pd.Series.to_list(travels.Target)
+            name = pd.Series.to_list(travels.Source)
 
             list_of_tuples = list(
                 zip(
@@ -496,50 +1321,16 @@ class diogenetGraph:
         return self.travels_graph_data
 
     def create_edges_for_custom_map(self, travels_graph_data):
-        travels_graph_data = travels_graph_data
         travels_graph_data_for_graph = travels_graph_data.copy()
-        lat_source = []
-        lon_source = []
-        lat_target = []
-        lon_target = []
-        color_source = []
-        color_target = []
-
-        for idx, cell in enumerate(travels_graph_data.source):
-            lat_source.append(
-                pd.Series.to_list(
-                    self.location_raw_data.lat[self.location_raw_data.name == travels_graph_data.source[idx]]
-                )    
-            )
-
-            lon_source.append(
-                pd.Series.to_list(
-                    self.location_raw_data.lon[self.location_raw_data.name == travels_graph_data.source[idx]]
-                )    
-            )
-
-            lat_target.append(
-                pd.Series.to_list(
-                    self.location_raw_data.lat[self.location_raw_data.name == travels_graph_data.target[idx]]
-                )    
-            )
-
-            lon_target.append(
-                pd.Series.to_list(
-                    self.location_raw_data.lon[self.location_raw_data.name == travels_graph_data.target[idx]]
-                )    
-            )
-            
-            color_source.append("#440154")
-            color_target.append("#482878")
+        source_coordinates = self.get_coordinates(travels_graph_data.source)
+        target_coordinates = self.get_coordinates(travels_graph_data.target)
 
-
-        travels_graph_data_for_graph["lat_source"] = [item for sublist in lat_source for item in sublist]
-        travels_graph_data_for_graph["lon_source"] = [item for sublist in lon_source for item in sublist]
-        travels_graph_data_for_graph["lat_target"] = [item for sublist in lat_target for item in sublist]
-        travels_graph_data_for_graph["lon_target"] = [item for sublist in lon_target for item in sublist]
-        travels_graph_data_for_graph["color_source"] = color_source
-        travels_graph_data_for_graph["color_target"] = color_target
+        travels_graph_data_for_graph["lat_source"] = source_coordinates.lat.to_numpy()
+        travels_graph_data_for_graph["lon_source"] = source_coordinates.lon.to_numpy()
+        travels_graph_data_for_graph["lat_target"] = target_coordinates.lat.to_numpy()
+        travels_graph_data_for_graph["lon_target"] = target_coordinates.lon.to_numpy()
+        travels_graph_data_for_graph["color_source"] = "#440154"
+        travels_graph_data_for_graph["color_target"] = "#482878"
 
         return(travels_graph_data_for_graph)
 
@@ -551,39 +1342,188 @@ class diogenetGraph:
                 self.travels_graph_data, directed=False, edge_attrs=["edge_name"]
             )
 
-            def search_group_attribute(node_name):
-                group_name = ""
-                # for node in
-                return group_name
+            # First "Groups" value of each name, looked up for every vertex at once
+            groups = self.nodes_raw_data.drop_duplicates("Name").set_index("Name")[
+                "Groups"
+            ]
+            self.igraph_graph.vs["group"] = groups.reindex(
+                self.igraph_graph.vs["name"]
+            ).tolist()
+
+            edge_names = pd.Series(self.igraph_graph.es["edge_name"])
+            self.edge_index_table = edge_names.groupby(edge_names).indices
+            self.subgraph_cache = LRUCache(SUBGRAPH_CACHE_SIZE)
+            self.centrality_cache = LRUCache(CENTRALITY_CACHE_SIZE)
+            self.layout_positions = {}
+            self.layout_fingerprints = {}
+            self.layout_tokens = {}
+
+    def get_centrality(self, name, function):
+        """Return a centrality of the current subgraph, calculated once per subgraph
+
+        :param name: Name of the centrality
+        :param function: Function calculating the centrality of an igraph graph
+        :return: A list with the centrality of each vertex
+        :rtype: :py:class:`list`
+        """
+        actual_graph = self.get_current_subgraph()
+        key = (self.subgraph_key, name)
+        values = self.centrality_cache.get(key)
+        if values is None:
+            values = function(actual_graph)
+            self.centrality_cache.put(key, values)
+        return list(values)
+
+    def get_simple_subgraph(self):
+        """Return the current subgraph with its parallel edges collapsed,
+           created once per subgraph (the subgraph itself when it has none)
+        """
+        actual_graph = self.get_current_subgraph()
+        key = (self.subgraph_key, "simple_graph")
+        simple_graph = self.centrality_cache.get(key)
+        if simple_graph is None:
+            simple_graph = get_simple_graph(actual_graph)
+            self.centrality_cache.put(key, simple_graph)
+        return simple_graph
+
+    def centrality_table(self, normalized=False, backend="igraph"):
+        """Return degree, betweenness, closeness and eigenvector of every vertex
+        of the current subgraph
+
+        :param normalized: Scale the centralities the way NetworkX does
+        (degree and betweenness over their maximum, closeness weighted by the
+        reachable fraction of the graph, eigenvector with unit norm)
+        :param backend: "igraph", or "networkx" to cross-check the igraph
+        values. NetworkX values are always normalized
+        :return: A dataframe indexed by vertex name with the columns Degree,
+        Betweeness, Closeness and Eigenvector. Parallel edges (several travels
+        between two places) are counted once
+        :rtype: :py:class:`pd.DataFrame`
+        """
+        if self.igraph_graph is not None:
+            actual_graph = self.get_current_subgraph()
+            if backend == "networkx":
+                if not normalized:
+                    raise ValueError("NetworkX centralities are always normalized")
+                return networkx_centrality_frame(actual_graph)
+            if backend != "igraph":
+                raise ValueError("Unknown centrality backend: {}".format(backend))
+            simple_graph = self.get_simple_subgraph()
+            if simple_graph is not actual_graph:
+                return compute_centrality_table(
+                    simple_graph,
+                    normalized,
+                    self.betweenness_mode,
+                    self.betweenness_samples,
+                    self.betweenness_seed,
+                    self.betweenness_cutoff,
+                )
+            return centrality_frame(
+                actual_graph,
+                self.calculate_degree(),
+                self.calculate_betweenness(),
+                self.calculate_closeness(),
+                self.calculate_eigenvector(),
+                normalized,
+            )
 
-            attributes = []
-            self.nodes_raw_data.set_index(["Name"])
-            for node in self.igraph_graph.vs:
-                rows = self.nodes_raw_data.loc[
-                    self.nodes_raw_data["Name"] == node["name"]
-                ]
-                node["group"] = rows.iloc[0]["Groups"]
+    def get_sorted_centrality_table(self, normalized=False):
+        """Return the centrality table of the current subgraph with the rows
+           order of every column sorted ascending and descending
+
+        :param normalized: Scale the centralities the way NetworkX does
+        :return: The table (with the vertex names in the Phylosopher column)
+        and a dict {(column, ascending): rows positions}
+        :rtype: :py:class:`tuple`
+        """
+        if self.igraph_graph is not None:
+            self.get_current_subgraph()
+            key = (self.subgraph_key, "sorted_centrality_table", normalized)
+            result = self.centrality_cache.get(key)
+            if result is None:
+                table = self.centrality_table(normalized).reset_index()
+                sort_orders = {}
+                for column in table.columns:
+                    for ascending in (True, False):
+                        sort_orders[column, ascending] = (
+                            table[column]
+                            .sort_values(ascending=ascending, kind="stable")
+                            .index.to_numpy()
+                        )
+                result = (table, sort_orders)
+                self.centrality_cache.put(key, result)
+            return result
+
+    def get_centrality_table_page(
+        self, page_current, page_size, sort_column=None, ascending=True, normalized=False
+    ):
+        """Return one page of the centrality table of the current subgraph
+
+        Centralities and sort orders are calculated once per subgraph, so
+        paging and sorting only slice the stored table.
+
+        :param page_current: Page number, starting at 0
+        :param page_size: Rows per page
+        :param sort_column: Column to sort by, None to keep the vertex order
+        :param ascending: Sort direction
+        :param normalized: Scale the centralities the way NetworkX does
+        :rtype: :py:class:`pd.DataFrame`
+        """
+        table, sort_orders = self.get_sorted_centrality_table(normalized)
+        start = page_current * page_size
+        stop = start + page_size
+        if sort_column is None:
+            return table.iloc[start:stop]
+        return table.iloc[sort_orders[sort_column, ascending][start:stop]]
 
     def calculate_degree(self):
         """Calculate degree for the graph
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            return actual_graph.degree()
+            return self.get_centrality("degree", CENTRALITY_FUNCTIONS["degree"])
 
     def calculate_closeness(self):
         """Create closeness for the graph
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            return actual_graph.closeness()
+            function = CENTRALITY_FUNCTIONS["closeness"]
+            if self.use_distance_index and not self.is_local_subgraph():
+                function = self.get_distance_index_closeness
+            return self.get_centrality("closeness", function)
 
     def calculate_betweenness(self):
-        """Calculate betweenness for the graph
+        """Calculate betweenness for the graph, exactly or approximately
+           depending on betweenness_mode
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            return actual_graph.betweenness()
+            actual_graph = self.get_current_subgraph()
+            mode = get_betweenness_mode(actual_graph, self.betweenness_mode)
+            # Settings that do not change the result share the cached values
+            if mode == "sampled":
+                name = (
+                    "betweenness",
+                    mode,
+                    self.betweenness_samples,
+                    self.betweenness_seed,
+                )
+            elif mode == "cutoff":
+                name = ("betweenness", mode, self.betweenness_cutoff)
+            else:
+                name = ("betweenness", mode)
+            key = (self.subgraph_key, name)
+            result = self.centrality_cache.get(key)
+            if result is None:
+                result = compute_betweenness(
+                    actual_graph,
+                    mode=mode,
+                    samples=self.betweenness_samples,
+                    seed=self.betweenness_seed,
+                    cutoff=self.betweenness_cutoff,
+                )
+                self.centrality_cache.put(key, result)
+            betweenness, error = result
+            self.betweenness_error = None if error is None else list(error)
+            return list(betweenness)
 
     # def calculate_networkx_betweenness(self):
     #     """Calculate betweenness for the networkx graph
@@ -596,80 +1536,46 @@ class diogenetGraph:
         """Create degree for the graph
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            return actual_graph.evcent()
+            return self.get_centrality("eigenvector", CENTRALITY_FUNCTIONS["eigenvector"])
 
     def centralization_degree(self):
-        """Calculate unnormalized centralization degree for the graph
+        """Calculate normalized centralization degree for the graph (like R
+           igraph centr_degree, counting loops)
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            full_filename = get_graphml_temp_file()
-            actual_graph.write_graphmlz(full_filename, 1)
-
-            # run R script
-            # cent_degree = self.centralization_degree_r(full_filename)
-            # Commented out to fix R subsystem crash by elinarezv
-            cent_degree = []
-            cent_degree.append(1)
-            # Delete temp file
-            os.remove(full_filename)
-
-            return cent_degree[0]
+            vcount = self.get_current_subgraph().vcount()
+            return freeman_centralization(
+                self.calculate_degree(), vcount * (vcount - 1)
+            )
 
     def centralization_betweenness(self):
-        """Calculate unnormalized centralization betweenness for the graph
+        """Calculate normalized centralization betweenness for the graph (like
+           R igraph centr_betw)
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            full_filename = get_graphml_temp_file()
-            actual_graph.write_graphmlz(full_filename, 1)
-
-            # run R script
-            # cent_betweenness = self.centralization_betweenness_r(full_filename)
-            # Commented out to fix R subsystem crash by elinarezv
-            cent_betweenness = []
-            cent_betweenness.append(1)
-            # Delete temp file
-            os.remove(full_filename)
-
-            return cent_betweenness[0]
+            vcount = self.get_current_subgraph().vcount()
+            return freeman_centralization(
+                self.calculate_betweenness(), (vcount - 1) ** 2 * (vcount - 2) / 2
+            )
 
     def centralization_closeness(self):
-        """Calculate unnormalized centralization closeness for the graph
+        """Calculate normalized centralization closeness for the graph (like R
+           igraph centr_clo)
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            full_filename = get_graphml_temp_file()
-            actual_graph.write_graphmlz(full_filename, 1)
-
-            # run R script
-            # cent_closeness = self.centralization_closeness_r(full_filename)
-            # Commented out to fix R subsystem crash by elinarezv
-            cent_closeness = []
-            cent_closeness.append(1)
-            # Delete temp file
-            os.remove(full_filename)
-
-            return cent_closeness[0]
+            vcount = self.get_current_subgraph().vcount()
+            theoretical_max = 0
+            if vcount > 1:
+                theoretical_max = (vcount - 1) * (vcount - 2) / (2 * vcount - 3)
+            return freeman_centralization(self.calculate_closeness(), theoretical_max)
 
     def centralization_eigenvector(self):
-        """Calculate unnormalized centralization eigen vector for the graph
+        """Calculate normalized centralization eigen vector for the graph (like
+           R igraph centr_eigen)
         """
         if self.igraph_graph is not None:
-            actual_graph = self.create_subgraph()
-            full_filename = get_graphml_temp_file()
-            actual_graph.write_graphmlz(full_filename, 1)
-
-            # run R script
-            # cent_eigenvector = self.centralization_eigenvector_r(full_filename)
-            # Commented out to fix R subsystem crash by elinarezv
-            cent_eigenvector = []
-            cent_eigenvector.append(1)
-            # Delete temp file
-            os.remove(full_filename)
-
-            return cent_eigenvector[0]
+            vcount = self.get_current_subgraph().vcount()
+            return freeman_centralization(self.calculate_eigenvector(), vcount - 2)
 
     def get_vertex_names(self):
         """Return names for each vertex of the graph
@@ -751,11 +1657,11 @@ class diogenetGraph:
             (modularity, clusters_dict) = self.identify_communities()
             self.pyvis_title = "MODULARITY: {:0.4f}".format(modularity)
             self.pyvis_height = "88%"
-            for i in range(len(self.igraph_subgraph.vs)):
-                if self.igraph_subgraph.vs[i]["name"] in clusters_dict.keys():
-                    centrality_indexes.append(
-                        clusters_dict[self.igraph_subgraph.vs[i]["name"]]
-                    )
+            centrality_indexes = [
+                clusters_dict[name]
+                for name in self.igraph_subgraph.vs["name"]
+                if name in clusters_dict
+            ]
 
         centrality_indexes_min = min(centrality_indexes)
         centrality_indexes_max = max(centrality_indexes)
@@ -764,33 +1670,36 @@ class diogenetGraph:
 
     def set_graph_layout(self, layout):
         if self.igraph_graph is not None:
-            # self.create_subgraph()
-            N = len(self.igraph_subgraph.vs)
+            actual_graph = self.get_current_subgraph()
             if layout == "kk":
-                self.graph_layout = self.igraph_subgraph.layout_kamada_kawai()
                 self.graph_layout_name = "kk"
                 self.factor = 80
             elif layout == "grid_fr":
-                self.graph_layout = self.igraph_subgraph.layout_grid()
                 self.graph_layout_name = "grid_fr"
                 self.factor = 80
             elif layout == "circle":
-                self.graph_layout = self.igraph_subgraph.layout_circle()
                 self.graph_layout_name = "circle"
                 self.factor = 250
                 self.node_size_factor = 1
             elif layout == "sphere":
-                self.graph_layout = self.igraph_subgraph.layout_sphere()
                 self.graph_layout_name = "sphere"
                 self.factor = 250
                 self.node_size_factor = 1
             else:
-                self.graph_layout = self.igraph_subgraph.layout_fruchterman_reingold()
                 self.graph_layout_name = "fr"
                 self.factor = 50
 
-            self.Xn = [self.graph_layout[k][0] for k in range(N)]
-            self.Yn = [self.graph_layout[k][1] for k in range(N)]
+            if self.layout_warm_start and self.graph_layout_name in WARM_START_LAYOUTS:
+                coordinates = self.get_warm_start_layout(
+                    actual_graph, self.graph_layout_name
+                )
+            else:
+                coordinates = get_layout(
+                    actual_graph, self.graph_layout_name, self.subgraph_fingerprint
+                )
+            self.graph_layout = igraph.Layout(coordinates.tolist())
+            self.Xn = coordinates[:, 0].tolist()
+            self.Yn = coordinates[:, 1].tolist()
 
     def get_pyvis_options(
         self, min_weight=4, max_weight=6, min_label_size=4, max_label_size=6,
@@ -840,6 +1749,232 @@ class diogenetGraph:
         pyvis_map_options["configure"] = {"enabled": False}
         return pyvis_map_options
 
+    def set_layout_session(self, session):
+        """Share the warm start positions of this view with the earlier views
+           of the same session (and graph), and only with them
+
+        :param session: Key identifying the session of the user
+        """
+        self.layout_session = session
+        key = (session, self.graph_type, self.nodes_file, self.edges_file)
+        state = _warm_start_states.get(key)
+        if state is None:
+            state = ({}, {}, {})
+            _warm_start_states.put(key, state)
+        self.layout_positions, self.layout_fingerprints, self.layout_tokens = state
+
+    def get_warm_start_token(self, graph, layout_name):
+        """Return the token of the layout get_warm_start_layout gives graph
+
+        A warm started layout only depends on graph and on the previous
+        layout of the session, so the token hashes the previous token with
+        the fingerprints of both subgraphs: equal tokens mean equal
+        coordinates, whatever the session.
+
+        :param graph: Current subgraph
+        :param str layout_name: "kk" or "fr"
+        :return: The token, None when graph gets the layout shared by every
+        session (see get_layout) because there is nothing to refine from
+        :rtype: :py:class:`str`
+        """
+        previous_fingerprint = self.layout_fingerprints.get(layout_name)
+        previous_token = self.layout_tokens.get(layout_name)
+        if previous_fingerprint == self.subgraph_fingerprint:
+            return previous_token
+        positions = self.layout_positions.get(layout_name)
+        if not positions or not any(name in positions for name in graph.vs["name"]):
+            return None
+        state = (
+            previous_token,
+            previous_fingerprint,
+            self.subgraph_fingerprint,
+            layout_name,
+        )
+        return hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+
+    def get_warm_start_layout(self, graph, layout_name):
+        """Return a layout of graph refined from the positions of the vertices
+        in the previous subgraph placed by the same layout, so changing
+        the filters keeps the graph stable
+
+        :param graph: Current subgraph
+        :param str layout_name: "kk" or "fr"
+        :return: An array with the coordinates of every vertex
+        :rtype: :py:class:`np.ndarray`
+        """
+        names = graph.vs["name"]
+        token = self.get_warm_start_token(graph, layout_name)
+        if token is None:
+            coordinates = get_layout(graph, layout_name, self.subgraph_fingerprint)
+        else:
+            coordinates = _warm_start_layouts.get(token)
+            if coordinates is None:
+                positions = self.layout_positions[layout_name]
+                if self.layout_fingerprints.get(layout_name) == self.subgraph_fingerprint:
+                    coordinates = np.array(
+                        [positions[name] for name in names], dtype=float
+                    )
+                else:
+                    coordinates = refine_layout(
+                        graph, layout_name, get_warm_start_seed(graph, positions)
+                    )
+                coordinates.flags.writeable = False
+                _warm_start_layouts.put(token, coordinates)
+        self.layout_positions[layout_name] = dict(
+            zip(names, map(tuple, coordinates.tolist()))
+        )
+        self.layout_fingerprints[layout_name] = self.subgraph_fingerprint
+        self.layout_tokens[layout_name] = token
+        return coordinates
+
+    def get_layout_token(self, layout="fr"):
+        """Return the token of the layout set_graph_layout would give the
+           current subgraph (see get_warm_start_token)
+
+        :param str layout: Layout given to the renderer
+        :return: The token, None when the layout is not warm started
+        :rtype: :py:class:`str`
+        """
+        layout_name = get_layout_name(layout)
+        if (
+            self.igraph_graph is None
+            or not self.layout_warm_start
+            or layout_name not in WARM_START_LAYOUTS
+        ):
+            return None
+        actual_graph = self.get_current_subgraph()
+        if actual_graph is None:
+            return None
+        return self.get_warm_start_token(actual_graph, layout_name)
+
+    def record_layout(self, layout="fr"):
+        """Move the warm start positions on to the layout of the current
+           subgraph without drawing it, for pages served already rendered
+
+        :param str layout: Layout given to the renderer
+        """
+        if (
+            self.igraph_graph is not None
+            and self.layout_warm_start
+            and get_layout_name(layout) in WARM_START_LAYOUTS
+        ):
+            self.set_graph_layout(layout)
+
+    def get_vis_data(
+        self, min_weight=4, max_weight=6, layout="fr", avoid_centrality=False,
+    ):
+        """Create the nodes and edges of the current subgraph as vis.js draws them
+        :param int min_weight: Integer with min node size
+        :param int max_weight: Integer with max node size
+        :param str layout: String with a valid iGraph Layout like
+        "fruchterman_reingold", "kamada_kawai" or "circle"
+        :param bool avoid_centrality: Draw every node with the same color
+        :return: A dict with "nodes" (id, label, color, size, x, y, shape and
+        title) and "edges" (from, to, title and color), each a dict of lists
+        :rtype: :py:class:`dict`
+        """
+        vis_data = None
+
+        if self.igraph_graph is not None:
+            (
+                centrality_indexes,
+                centrality_indexes_min,
+                centrality_indexes_max,
+            ) = self.get_graph_centrality_indexes()
+
+            # if (self.graph_layout is None) or (layout != self.graph_layout_name):
+            self.set_graph_layout(layout)
+
+            actual_graph = self.igraph_subgraph
+            names = np.array(actual_graph.vs["name"], dtype=object)
+            node_titles = names.copy()
+            sizes = get_interpolated_indexes(
+                centrality_indexes,
+                centrality_indexes_min,
+                centrality_indexes_max,
+                min_weight,
+                max_weight,
+            )
+
+            # self.create_subgraph()
+            # Add Nodes
+            if self.graph_type == "communities":
+                is_cut_vertex = self.get_subgraph_structure().cut_vertex_mask
+            else:
+                is_cut_vertex = np.zeros(len(names), dtype=bool)
+
+            if not avoid_centrality:
+                colors, _ = get_node_styles(centrality_indexes)
+                if self.pyvis_show_crossing_ties:
+                    colors = np.where(is_cut_vertex, colors, "#bbbbbb")
+                node_titles = node_titles + [
+                    " - {}: {:.3f}".format(self.current_centrality_index, value)
+                    for value in centrality_indexes
+                ]
+            else:
+                colors = np.full(len(names), "#ff6347")
+
+            node_shapes = np.full(len(names), "dot", dtype=object)
+            if self.pyvis_show_gender:
+                groups = np.array(actual_graph.vs["group"], dtype=object)
+                is_female = groups == "Female"
+                is_god = groups == "God"
+                node_shapes[is_female] = "star"
+                node_shapes[is_god] = "triangle"
+                node_titles = node_titles + np.where(
+                    is_female, " - Female", np.where(is_god, " - God", " - Male")
+                ).astype(object)
+
+            nodes = {
+                "id": list(range(len(names))),
+                "label": names.tolist(),
+                "color": colors.tolist(),
+                "size": (sizes * self.node_size_factor).astype(int).tolist(),
+                "x": (np.asarray(self.Xn, dtype=float) * self.factor).astype(int).tolist(),
+                "y": (np.asarray(self.Yn, dtype=float) * self.factor).astype(int).tolist(),
+                "shape": node_shapes.tolist(),
+                "title": node_titles.tolist(),
+            }
+
+            edges_colors_list = {
+                "is teacher of": "#411271",
+                "is friend of": "#4542B9",
+                "is family of": "#1FC3CD",
+                "is benefactor of": "#01AA31",
+                "studied the work of": "#F5C603",
+                "sent letters to": "#D62226",
+            }
+            edges_list = np.array(actual_graph.get_edgelist(), dtype=int).reshape(-1, 2)
+            sources = edges_list[:, 0]
+            targets = edges_list[:, 1]
+            edge_names = np.array(actual_graph.es["edge_name"], dtype=object)
+            if self.graph_type == "map":
+                edge_titles = (
+                    edge_names + " travels from: " + names[sources] + " to: " + names[targets]
+                )
+                edge_colors = ["#ff6347"] * len(edge_names)
+            else:
+                edge_titles = names[sources] + " " + edge_names + " " + names[targets]
+                edge_colors = np.array(
+                    [edges_colors_list[edge_name] for edge_name in edge_names],
+                    dtype=object,
+                )
+                if self.pyvis_show_crossing_ties:
+                    edge_colors[
+                        ~(is_cut_vertex[sources] & is_cut_vertex[targets])
+                    ] = "#888888"
+                edge_colors = edge_colors.tolist()
+
+            edges = {
+                "from": sources.tolist(),
+                "to": targets.tolist(),
+                "title": edge_titles.tolist(),
+                "color": edge_colors,
+            }
+
+            vis_data = {"nodes": nodes, "edges": edges}
+        return vis_data
+
     def get_pyvis(
         self,
         min_weight=4,
@@ -861,17 +1996,8 @@ class diogenetGraph:
         """
         pv_graph = None
 
-        random.seed(1234)
-
         if self.igraph_graph is not None:
-            (
-                centrality_indexes,
-                centrality_indexes_min,
-                centrality_indexes_max,
-            ) = self.get_graph_centrality_indexes()
-
-            # if (self.graph_layout is None) or (layout != self.graph_layout_name):
-            self.set_graph_layout(layout)
+            vis_data = self.get_vis_data(min_weight, max_weight, layout, avoid_centrality)
 
             pv_graph = pyvis.network.Network(
                 height=self.pyvis_height, width="100%", heading=self.pyvis_title
@@ -882,112 +2008,66 @@ class diogenetGraph:
             pv_graph.set_options(json.dumps(pyvis_map_options))
             # pv_graph.show_buttons()
 
-            # self.create_subgraph()
-            # Add Nodes
-            cut_vertex = []
-            if self.graph_type == "communities":
-                cut_vertex = self.igraph_subgraph.cut_vertices()
-
-            for node in self.igraph_subgraph.vs:
-                node_title = node["name"]
-                if not avoid_centrality:
-                    if self.pyvis_show_crossing_ties:
-                        if node.index in cut_vertex:
-                            color_index = self.get_interpolated_index(
-                                centrality_indexes_min,
-                                centrality_indexes_max,
-                                centrality_indexes[node.index],
-                            )
-                            color = "#" + self.rgb_to_hex(VIRIDIS_COLORMAP[color_index])
-                        else:
-                            color = "#bbbbbb"
-                    else:
-                        color_index = self.get_interpolated_index(
-                            centrality_indexes_min,
-                            centrality_indexes_max,
-                            centrality_indexes[node.index],
-                        )
-                        color = "#" + self.rgb_to_hex(VIRIDIS_COLORMAP[color_index])
-
-                    node_title += (
-                        " - "
-                        + self.current_centrality_index
-                        + ": "
-                        + "{:.3f}".format(centrality_indexes[node.index])
-                    )
-                else:
-                    color = "#ff6347"
-
-                size = self.get_interpolated_index(
-                    centrality_indexes_min,
-                    centrality_indexes_max,
-                    centrality_indexes[node.index],
-                    min_weight,
-                    max_weight,
-                )
-                node_shape = "dot"
-                if self.pyvis_show_gender:
-                    if node["group"] == "Female":
-                        node_shape = "star"
-                        node_title += " - Female"
-                    elif node["group"] == "God":
-                        node_shape = "triangle"
-                        node_title += " - God"
-                    else:
-                        node_title += " - Male"
-
+            nodes = vis_data["nodes"]
+            for node_id, label, color, size, x, y, shape, title in zip(
+                nodes["id"],
+                nodes["label"],
+                nodes["color"],
+                nodes["size"],
+                nodes["x"],
+                nodes["y"],
+                nodes["shape"],
+                nodes["title"],
+            ):
                 pv_graph.add_node(
-                    node.index,
-                    label=node["name"],
+                    node_id,
+                    label=label,
                     color=color,
-                    size=int(size * self.node_size_factor),
-                    x=int(self.Xn[node.index] * self.factor),
-                    y=int(self.Yn[node.index] * self.factor),
-                    shape=node_shape,
-                    title=node_title,
+                    size=size,
+                    x=x,
+                    y=y,
+                    shape=shape,
+                    title=title,
                 )
 
-            edges = {}
-            i = 1
-            edges_colors_list = {
-                "is teacher of": "#411271",
-                "is friend of": "#4542B9",
-                "is family of": "#1FC3CD",
-                "is benefactor of": "#01AA31",
-                "studied the work of": "#F5C603",
-                "sent letters to": "#D62226",
-            }
-            for edge in self.igraph_subgraph.es:
-                if self.graph_type == "map":
-                    title = (
-                        edge["edge_name"]
-                        + " travels from: "
-                        + self.igraph_subgraph.vs[edge.source]["name"]
-                        + " to: "
-                        + self.igraph_subgraph.vs[edge.target]["name"]
-                    )
-                    edge_color = "#ff6347"
-                else:
-                    title = (
-                        self.igraph_subgraph.vs[edge.source]["name"]
-                        + " "
-                        + edge["edge_name"]
-                        + " "
-                        + self.igraph_subgraph.vs[edge.target]["name"]
-                    )
-                    edge_color = ""
-                    if self.pyvis_show_crossing_ties:
-                        if edge.source in cut_vertex and edge.target in cut_vertex:
-                            edge_color = edges_colors_list[edge["edge_name"]]
-                        else:
-                            edge_color = "#888888"
-                    else:
-                        edge_color = edges_colors_list[edge["edge_name"]]
-                pv_graph.add_edge(
-                    edge.source, edge.target, title=title, color=edge_color
-                )
+            edges = vis_data["edges"]
+            for source, target, title, color in zip(
+                edges["from"], edges["to"], edges["title"], edges["color"]
+            ):
+                pv_graph.add_edge(source, target, title=title, color=color)
         return pv_graph
 
+    def get_vis_payload(
+        self,
+        min_weight=4,
+        max_weight=6,
+        min_label_size=4,
+        max_label_size=6,
+        layout="fr",
+        avoid_centrality=False,
+    ):
+        """Create the data the static vis.js page (assets/vis_graph.html) draws,
+           an alternative to the full html page of get_pyvis
+        :param int min_weight: Integer with min node size
+        :param int max_weight: Integer with max node size
+        :param int min_label_size: Integer with min label size
+        :param int max_label_size: Integer with max label size
+        :param str layout: String with a valid iGraph Layout like
+        "fruchterman_reingold", "kamada_kawai" or "circle"
+        :return: get_vis_data columns plus the vis.js "options", "heading"
+        and "height" of the graph, ready to be dumped as json
+        :rtype: :py:class:`dict`
+        """
+        payload = None
+        if self.igraph_graph is not None:
+            payload = self.get_vis_data(min_weight, max_weight, layout, avoid_centrality)
+            payload["options"] = self.get_pyvis_options(
+                min_weight, max_weight, min_label_size, max_label_size
+            )
+            payload["heading"] = self.pyvis_title
+            payload["height"] = self.pyvis_height
+        return payload
+
     def get_igraph_plot(
         self,
         min_weight=4,
@@ -1013,16 +2093,11 @@ class diogenetGraph:
             else:
                 centrality_indexes = self.calculate_eigenvector()
 
-            centrality_indexes_min = min(centrality_indexes)
-            centrality_indexes_max = max(centrality_indexes)
+            colors, sizes = get_node_styles(centrality_indexes, min_weight, max_weight)
+            colors = colors.tolist()
+            sizes = sizes.tolist()
 
             map = []
-            # nodes = self.get_edges_names()
-            nodes = self.get_vertex_names()
-            # print("self.travels_graph_data")
-            # print(self.travels_graph_data)
-            # print("nodes")
-            # print(nodes)
             map_dict_strings = [
                 "Source",
                 "Destination",
@@ -1036,59 +2111,105 @@ class diogenetGraph:
 
                 self.tabulate_subgraph_data()
 
-                for record in self.travels_subgraph_data:
-                    index = 0
-                    map_record = {}
-                    for item in record:
-                        tmp_value = item
-                        if isinstance(item, list):
-                            if len(item) == 1:
-                                tmp_value = item[0]
-                        map_record[map_dict_strings[index]] = tmp_value
-                        if index == 0:
-                            i = nodes.index(tmp_value)
-                            color_index = self.get_interpolated_index(
-                                centrality_indexes_min,
-                                centrality_indexes_max,
-                                centrality_indexes[i],
-                            )
-                            color = "#" + self.rgb_to_hex(VIRIDIS_COLORMAP[color_index])
-                            map_record["SourceColor"] = color
-                            size = self.get_interpolated_index(
-                                centrality_indexes_min,
-                                centrality_indexes_max,
-                                centrality_indexes[i],
-                                min_weight,
-                                max_weight,
-                            )
-                            map_record["SourceSize"] = size
-                        elif index == 1:
-                            i = nodes.index(tmp_value)
-                            color_index = self.get_interpolated_index(
-                                centrality_indexes_min,
-                                centrality_indexes_max,
-                                centrality_indexes[i],
-                            )
-                            color = "#" + self.rgb_to_hex(VIRIDIS_COLORMAP[color_index])
-                            map_record["DestinationColor"] = color
-                            size = self.get_interpolated_index(
-                                centrality_indexes_min,
-                                centrality_indexes_max,
-                                centrality_indexes[i],
-                                min_weight,
-                                max_weight,
-                            )
-                            map_record["DestinationSize"] = size
-                        index = index + 1
+                # travels_subgraph_data rows follow the order of the subgraph edges
+                edges_list = self.igraph_subgraph.get_edgelist()
+                for record, (source, target) in zip(self.travels_subgraph_data, edges_list):
+                    values = [
+                        item[0] if isinstance(item, list) and len(item) == 1 else item
+                        for item in record
+                    ]
+                    map_record = {
+                        "Source": values[0],
+                        "SourceColor": colors[source],
+                        "SourceSize": sizes[source],
+                        "Destination": values[1],
+                        "DestinationColor": colors[target],
+                        "DestinationSize": sizes[target],
+                    }
+                    map_record.update(zip(map_dict_strings[2:], values[2:]))
                     map.append(map_record)
         return map
 
+    def get_render_key(self, renderer, render_params):
+        """Return a key identifying a rendering of the current subgraph
+
+        The key covers the data files, the subgraph filters, the plot,
+        layout and centrality settings of the graph, the layout a warm
+        started layout is refined from and the parameters given to the
+        renderer.
+
+        :param str renderer: Name of the renderer ("pyvis", "folium", ...)
+        :param dict render_params: Parameters given to the renderer
+        :rtype: :py:class:`str`
+        """
+        edges_filter, local_phylosopher, local_order = self.get_subgraph_key()
+        state = (
+            renderer,
+            self.graph_type,
+            self.nodes_file,
+            self.edges_file,
+            self.locations_file,
+            self.blacklist_file,
+            self.data_mtimes,
+            sorted(edges_filter),
+            local_phylosopher,
+            local_order,
+            self.current_centrality_index,
+            self.pyvis_show_gender,
+            self.pyvis_show_crossing_ties,
+            self.comm_alg,
+            # Warm started layouts depend on the layout they were refined
+            # from, cold ones are shared by every session
+            self.get_layout_token(render_params.get("layout", "fr"))
+            if renderer in ("pyvis", "visjs")
+            else None,
+            self.betweenness_mode,
+            self.betweenness_samples,
+            self.betweenness_seed,
+            self.betweenness_cutoff,
+            self.use_distance_index,
+            sorted(render_params.items()),
+        )
+        return hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+
     def set_edges_filter(self, edges_filter):
         """Create subgraph depending on vertex selected
         """
         # if (edges_filter  not in self.edges_filter):
         # self.edges_filter = []
         self.edges_filter.append(edges_filter)
+        self.invalidate_subgraph()
+
+    def invalidate_subgraph(self):
+        """Mark the current subgraph (and its centralities) as outdated
+        """
+        self.subgraph_key = None
+
+    def get_subgraph_key(self):
+        """Return the key of the subgraph defined by the edges filter and,
+           for local graphs, the local phylosopher and order
+        """
+        if not self.edges_filter:
+            if self.graph_type == "map":
+                edges_filter = self.edge_index_table.keys()
+            else:
+                edges_filter = ["is teacher of"]
+        else:
+            edges_filter = self.edges_filter
+        edges_filter = frozenset(edges_filter)
+        if self.graph_type == "local" and self.local_phylosopher:
+            return (edges_filter, self.local_phylosopher, self.local_order)
+        return (edges_filter, None, None)
+
+    def get_current_subgraph(self):
+        """Return the subgraph for the current filters, creating it only when
+           the filters changed since the last call to create_subgraph
+        """
+        if self.igraph_graph is None:
+            return None
+        if self.igraph_subgraph is None or self.subgraph_key != self.get_subgraph_key():
+            self.create_subgraph()
+        return self.igraph_subgraph
 
     def create_subgraph(self):
         """Create subgraph depending on edges selected (i.e travellers in case of)
@@ -1097,29 +2218,11 @@ class diogenetGraph:
 
         subgraph = None
         if self.igraph_graph is not None:
-            edges = self.igraph_graph.es
-            edge_names = self.igraph_graph.es["edge_name"]
-            # print('edge_names')
-            # print(edge_names)
-            if not self.edges_filter:
-                if self.graph_type == "map":
-                    edges_filter = edge_names
-                else:
-                    edges_filter = "is teacher of"
-            else:
-                # if not self.edges_filter:
-                edges_filter = self.edges_filter
-                # print("travellers")
-                # print(travellers)
-            edge_indexes = [
-                j.index for i, j in zip(edge_names, edges) if i in edges_filter
-            ]
-            subgraph = self.igraph_graph.subgraph_edges(edge_indexes)
+            key = self.get_subgraph_key()
+            edges_filter = key[0]
+            subgraph, fingerprint = self.get_filtered_subgraph(edges_filter)
 
             self.igraph_subgraph = subgraph
-            
-            self.networkx_subgraph = nx.DiGraph(subgraph.to_networkx())
-            #print(nx.betweenness_centrality(nx.DiGraph(subgraph.to_networkx())))
 
             """Create local subgraph depending on vertex selected (i.e phylosophers)
             """
@@ -1127,14 +2230,126 @@ class diogenetGraph:
             if self.graph_type == "local":
                 # If no vertex selected return global graph
                 if self.local_phylosopher:
-                    neighbour_vertex = subgraph.neighborhood(
-                        self.local_phylosopher, self.local_order
-                    )
-                    # for number in neighbour_vertex:
-                    #    print(actual_graph.vs["name"][number])
-                    # print(neighbour_vertex)
-                    subgraph = subgraph.induced_subgraph(neighbour_vertex)
+                    local_subgraph = self.subgraph_cache.get(key)
+                    if local_subgraph is None:
+                        distance_index = None
+                        if self.use_distance_index:
+                            distance_index = get_distance_index(subgraph, fingerprint)
+                        if distance_index is not None:
+                            neighbour_vertex = distance_index.neighborhood(
+                                self.local_phylosopher, self.local_order
+                            )
+                        else:
+                            neighbour_vertex = subgraph.neighborhood(
+                                self.local_phylosopher, self.local_order
+                            )
+                        local_subgraph = subgraph.induced_subgraph(neighbour_vertex)
+                        local_subgraph = (
+                            local_subgraph,
+                            get_graph_fingerprint(local_subgraph),
+                        )
+                        self.subgraph_cache.put(key, local_subgraph)
+                    subgraph, fingerprint = local_subgraph
                 self.igraph_subgraph = subgraph
+            self.subgraph_key = key
+            self.subgraph_fingerprint = fingerprint
+        return subgraph
+
+    def is_local_subgraph(self):
+        return self.graph_type == "local" and bool(self.local_phylosopher)
+
+    def get_distance_index(self):
+        """Return the hop distance index of the subgraph of the current
+           edges filter, None when it can not be indexed (see get_distance_index)
+
+        :rtype: :py:class:`HopDistanceIndex`
+        """
+        if self.igraph_graph is None:
+            return None
+        subgraph, fingerprint = self.get_filtered_subgraph(self.get_subgraph_key()[0])
+        return get_distance_index(subgraph, fingerprint)
+
+    def get_distance_index_closeness(self, graph):
+        distance_index = self.get_distance_index()
+        if distance_index is None:
+            return CENTRALITY_FUNCTIONS["closeness"](graph)
+        return distance_index.closeness().tolist()
+
+    def get_ego_networks(self, egos, order=1, centrality=True, normalized=True):
+        """Return the ego networks of several phylosophers at once
+
+        The neighborhoods of every ego are found with a single call on the
+        subgraph of the current edges filter (or read from its distance
+        index when use_distance_index is set). Ego networks already created
+        by create_subgraph are reused.
+
+        :param egos: Names of the phylosophers
+        :param order: Order of the ego networks
+        :param centrality: Calculate the centrality table of each ego network
+        :param normalized: Scale the centralities the way NetworkX does
+        (betweenness follows betweenness_mode)
+        :return: A dict {ego: (ego network, centrality table)}, with None
+        tables when centrality is False. Egos that are not in the subgraph
+        are left out
+        :rtype: :py:class:`dict`
+        """
+        ego_networks = {}
+        if self.igraph_graph is None:
+            return ego_networks
+        edges_filter = self.get_subgraph_key()[0]
+        subgraph, fingerprint = self.get_filtered_subgraph(edges_filter)
+        names = set(subgraph.vs["name"])
+        egos = [ego for ego in dict.fromkeys(egos) if ego in names]
+        if not egos:
+            return ego_networks
+        distance_index = None
+        if self.use_distance_index:
+            distance_index = get_distance_index(subgraph, fingerprint)
+        if distance_index is not None:
+            neighborhoods = [distance_index.neighborhood(ego, order) for ego in egos]
+        else:
+            neighborhoods = subgraph.neighborhood(egos, order)
+        for ego, neighbour_vertex in zip(egos, neighborhoods):
+            local_subgraph = self.subgraph_cache.get((edges_filter, ego, order))
+            if local_subgraph is None:
+                ego_network = subgraph.induced_subgraph(neighbour_vertex)
+            else:
+                ego_network = local_subgraph[0]
+            table = None
+            if centrality:
+                table = compute_centrality_table(
+                    ego_network,
+                    normalized,
+                    self.betweenness_mode,
+                    self.betweenness_samples,
+                    self.betweenness_seed,
+                    self.betweenness_cutoff,
+                )
+            ego_networks[ego] = (ego_network, table)
+        return ego_networks
+
+    def get_filtered_subgraph(self, edges_filter):
+        """Return the subgraph with the edges whose name is in edges_filter
+
+        Subgraphs are shared by every copy of the graph and must not be
+        modified in place.
+
+        :param edges_filter: frozenset with the edge names (relations or travelers)
+        :return: A subgraph of igraph_graph and its fingerprint
+        :rtype: :py:class:`tuple`
+        """
+        subgraph = self.subgraph_cache.get(edges_filter)
+        if subgraph is None:
+            edge_indexes = [
+                self.edge_index_table[name]
+                for name in edges_filter
+                if name in self.edge_index_table
+            ]
+            if edge_indexes:
+                edge_indexes = np.sort(np.concatenate(edge_indexes)).tolist()
+            subgraph = self.igraph_graph.subgraph_edges(edge_indexes)
+            subgraph = (subgraph, get_graph_fingerprint(subgraph))
+            self.subgraph_cache.put(edges_filter, subgraph)
         return subgraph
 
     # def create_subgraph_network(self):
@@ -1209,57 +2424,21 @@ class diogenetGraph:
         lat_target = []
         lon_target = []
 
-        vertex_list = []
-        edges_list = []
-
-        if self.igraph_subgraph:
-            for vertex in self.igraph_subgraph.vs:
-                vertex_list.append(vertex["name"])
-
         if self.igraph_subgraph:
-            for idx, edges in enumerate(self.igraph_subgraph.es):
-                source.append(vertex_list[edges.tuple[0]])
-                target.append(vertex_list[edges.tuple[1]])
-                name.append(edges["edge_name"])
-                lat_source.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lat[
-                            self.location_raw_data.name.isin(
-                                [vertex_list[edges.tuple[0]]]
-                            )
-                        ]
-                    )
-                )
-
-                lon_source.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lon[
-                            self.location_raw_data.name.isin(
-                                [vertex_list[edges.tuple[0]]]
-                            )
-                        ]
-                    )
-                )
-
-                lat_target.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lat[
-                            self.location_raw_data.name.isin(
-                                [vertex_list[edges.tuple[1]]]
-                            )
-                        ]
-                    )
-                )
-
-                lon_target.append(
-                    pd.Series.to_list(
-                        self.location_raw_data.lon[
-                            self.location_raw_data.name.isin(
-                                [vertex_list[edges.tuple[1]]]
-                            )
-                        ]
-                    )
-                )
+            vertex_list = self.igraph_subgraph.vs["name"]
+            edges_list = np.array(self.igraph_subgraph.get_edgelist(), dtype=int)
+            edges_list = edges_list.reshape(-1, 2)
+            source = [vertex_list[i] for i in edges_list[:, 0]]
+            target = [vertex_list[i] for i in edges_list[:, 1]]
+            name = self.igraph_subgraph.es["edge_name"]
+
+            vertex_coordinates = self.get_coordinates(vertex_list)
+            vertex_lat = vertex_coordinates.lat.to_numpy()
+            vertex_lon = vertex_coordinates.lon.to_numpy()
+            lat_source = coordinates_to_lists(vertex_lat[edges_list[:, 0]])
+            lon_source = coordinates_to_lists(vertex_lon[edges_list[:, 0]])
+            lat_target = coordinates_to_lists(vertex_lat[edges_list[:, 1]])
+            lon_target = coordinates_to_lists(vertex_lon[edges_list[:, 1]])
 
         list_of_tuples = list(
             zip(source, target, name, lat_source, lon_source, lat_target, lon_target)
@@ -1281,110 +2460,266 @@ class diogenetGraph:
     def create_local_graph(self):
         return ()
 
-    def fix_dendrogram(self, graph, cl):
-        already_merged = set()
-        for merge in cl.merges:
-            already_merged.update(merge)
+    def identify_communities(self):
+        """Return the communities of the current subgraph found by comm_alg,
+           computed once per algorithm and subgraph structure
 
-        num_dendrogram_nodes = graph.vcount() + len(cl.merges)
-        not_merged_yet = sorted(set(range(num_dendrogram_nodes)) - already_merged)
-        if len(not_merged_yet) < 2:
+        :return: The modularity and a dict {vertex name: community}
+        :rtype: :py:class:`tuple`
+        """
+        actual_graph = self.get_current_subgraph()
+        key = (self.comm_alg, self.subgraph_fingerprint, COMMUNITY_SEED)
+        result = _community_cache.get(key)
+        if result is None:
+            with seeded_random_number_generator(COMMUNITY_SEED):
+                result = self.compute_communities(actual_graph)
+            _community_cache.put(key, result)
+        return result
+
+    def compute_communities(self, actual_graph):
+        clustering = run_community_algorithm(actual_graph, self.comm_alg)
+
+        comm_Dict = dict(zip(actual_graph.vs["name"], clustering.membership))
+
+        return (clustering.modularity, comm_Dict)
+
+    def iter_community_comparison(self, algorithms=None, processes=None):
+        """Run several community algorithms on the current subgraph in a
+           process pool, yielding the result of each one as it finishes
+
+        Every result is also stored in the communities cache, so showing
+        any of the algorithms afterwards does not run it again.
+
+        :param algorithms: Names of the algorithms, by default every
+        algorithm in DENDROGRAM_COMMUNITY_ALGORITHMS and
+        CLUSTERING_COMMUNITY_ALGORITHMS
+        :param processes: Number of worker processes, by default the number
+        of CPUs
+        :return: Dicts with the algorithm, modularity, number of communities,
+        runtime in seconds, and the normalized mutual information (nmi) and
+        variation of information (vi) against every algorithm finished
+        before. Algorithms that fail give a dict with the algorithm and
+        the error
+        :rtype: :py:class:`dict`
+        """
+        actual_graph = self.get_current_subgraph()
+        if actual_graph is None:
             return
+        if algorithms is None:
+            algorithms = (
+                DENDROGRAM_COMMUNITY_ALGORITHMS + CLUSTERING_COMMUNITY_ALGORITHMS
+            )
+        names = actual_graph.vs["name"]
+        memberships = {}
+
+        def submit(pool):
+            return {
+                pool.submit(
+                    time_community_algorithm, actual_graph, algorithm, COMMUNITY_SEED
+                ): algorithm
+                for algorithm in algorithms
+            }
 
-        v1, v2 = not_merged_yet[:2]
-        cl._merges.append((v1, v2))
-        del not_merged_yet[:2]
-
-        missing_nodes = range(
-            num_dendrogram_nodes, num_dendrogram_nodes + len(not_merged_yet)
-        )
-        cl._merges.extend(zip(not_merged_yet, missing_nodes))
-        cl._nmerges = graph.vcount() - 1
-        return cl
-
-    def identify_communities(self):
-        clusters = []
-        actual_graph = self.create_subgraph()
-        if self.comm_alg == "community_infomap":
-            self.comm = actual_graph.community_infomap()
-            # print('community_infomap')
-            # membership = comm.membership
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-
-        if self.comm_alg == "community_edge_betweenness":
-            self.comm = actual_graph.community_edge_betweenness()
-            # print("community_edge_betweenness")
-            # print(vars(self.comm))
-            aux = self.fix_dendrogram(actual_graph, self.comm)
-            clusters_ini = aux.as_clustering()
-            clusters = clusters_ini.as_cover()
-            modularity = clusters_ini.modularity
-            # membership = clusters.membership
-
-        if self.comm_alg == "community_spinglass":
-            self.comm = actual_graph.community_spinglass()
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-            # membership = comm.membership
-
-        if self.comm_alg == "community_walktrap":
-            self.comm = actual_graph.community_walktrap()
-            aux = self.fix_dendrogram(actual_graph, self.comm)
-            clusters_ini = aux.as_clustering()
-            clusters = clusters_ini.as_cover()
-            modularity = clusters_ini.modularity
-            # membership = clusters.membership
-
-        if self.comm_alg == "community_leiden":
-            self.comm = actual_graph.community_leiden()
-            # membership = self.comm.membership
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-
-        if self.comm_alg == "community_fastgreedy":
-            self.comm = actual_graph.community_fastgreedy()
-            aux = self.fix_dendrogram(actual_graph, self.comm)
-            clusters_ini = aux.as_clustering()
-            clusters = clusters_ini.as_cover()
-            modularity = clusters_ini.modularity
-            # membership = clusters.membership
-
-        if self.comm_alg == "community_leading_eigenvector":
-            self.comm = actual_graph.community_leading_eigenvector()
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-            # membership = self.comm.membership
-
-        if self.comm_alg == "community_label_propagation":
-            self.comm = actual_graph.community_label_propagation()
-            # membership = self.comm.membership
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-
-        if self.comm_alg == "community_multilevel":
-            self.comm = actual_graph.community_multilevel()
-            clusters = self.comm.as_cover()
-            modularity = self.comm.modularity
-            # membership = self.comm.membership
-
-        community_data = []
-        community_names = []
-        for i in range(len(clusters)):
-            for j in range(len(clusters.subgraph(i).vs)):
-                community_data.append(i)
-                community_names.append(clusters.subgraph(i).vs[j]["name"])
-        comm_dataFrame = zip(community_names, community_data)
-        comm_Dict = dict(comm_dataFrame)
-
-        return (modularity, comm_Dict)
+        try:
+            futures = submit(get_community_pool(processes))
+        except BrokenProcessPool:
+            # A worker died in an earlier comparison
+            discard_community_pool(processes)
+            futures = submit(get_community_pool(processes))
+        try:
+            for future in as_completed(futures):
+                try:
+                    algorithm, membership, modularity, runtime = future.result()
+                except Exception as error:
+                    yield {"algorithm": futures[future], "error": str(error)}
+                    continue
+                _community_cache.put(
+                    (algorithm, self.subgraph_fingerprint, COMMUNITY_SEED),
+                    (modularity, dict(zip(names, membership))),
+                )
+                result = {
+                    "algorithm": algorithm,
+                    "modularity": modularity,
+                    "communities": max(membership, default=-1) + 1,
+                    "runtime": runtime,
+                    "nmi": {},
+                    "vi": {},
+                }
+                for other, other_membership in memberships.items():
+                    for method in ("nmi", "vi"):
+                        result[method][other] = igraph.compare_communities(
+                            membership, other_membership, method=method
+                        )
+                memberships[algorithm] = membership
+                yield result
+        finally:
+            # The caller may stop reading before every algorithm finished
+            for future in futures:
+                future.cancel()
+
+    def compare_communities(self, algorithms=None, processes=None):
+        """Run several community algorithms on the current subgraph in
+           parallel and tabulate their results
+
+        :param algorithms: Names of the algorithms, see iter_community_comparison
+        :param processes: Number of worker processes
+        :return: A dataframe indexed by algorithm with the columns Modularity,
+        Communities and Runtime, and two symmetric dataframes with the
+        normalized mutual information and the variation of information of
+        every pair of algorithms. Failed algorithms are left out
+        :rtype: :py:class:`tuple`
+        """
+        summary = {}
+        agreement = {"nmi": {}, "vi": {}}
+        for result in self.iter_community_comparison(algorithms, processes):
+            if "error" in result:
+                continue
+            algorithm = result["algorithm"]
+            summary[algorithm] = {
+                "Modularity": result["modularity"],
+                "Communities": result["communities"],
+                "Runtime": result["runtime"],
+            }
+            for method in ("nmi", "vi"):
+                # Identical partitions: nmi 1 and vi 0
+                agreement[method][(algorithm, algorithm)] = float(method == "nmi")
+                for other, value in result[method].items():
+                    agreement[method][(algorithm, other)] = value
+                    agreement[method][(other, algorithm)] = value
+        summary = pd.DataFrame.from_dict(summary, orient="index")
+        summary = summary.rename_axis("Algorithm")
+        tables = [summary]
+        for method in ("nmi", "vi"):
+            table = pd.Series(agreement[method], dtype=float).unstack()
+            tables.append(table.reindex(index=summary.index, columns=summary.index))
+        return tuple(tables)
+
+    def get_subgraph_structure(self):
+        """Return the cut vertices, bridges and components of the current
+           subgraph, analyzed once per subgraph structure
+
+        :rtype: :py:class:`SubgraphStructure`
+        """
+        actual_graph = self.get_current_subgraph()
+        if actual_graph is None:
+            return None
+        structure = _structure_cache.get(self.subgraph_fingerprint)
+        if structure is None:
+            structure = SubgraphStructure.from_graph(actual_graph)
+            _structure_cache.put(self.subgraph_fingerprint, structure)
+        return structure
 
     def get_cut_vertices(self):
-        cutVertices = self.igraph_subgraph.cut_vertices()
-        return cutVertices
+        return self.get_subgraph_structure().articulation_points
+
+
+def get_data_files_mtimes(
+    nodes_file=DATASET_NAME,
+    edges_file=DATASET_NAME,
+    locations_file=LOCATIONS_DATA_FILE,
+    blacklist_file=TRAVELS_BLACK_LIST_FILE,
+):
+    """Return the modification times of the files a graph is built from
+    """
+    return (
+        da.get_data_entity_mtime(da.get_dataset_file_name(nodes_file, "nodes")),
+        da.get_data_entity_mtime(da.get_dataset_file_name(edges_file, "edges")),
+        da.get_data_entity_mtime(locations_file),
+        da.get_data_entity_mtime(blacklist_file),
+    )
+
+
+def get_graph(
+    graph_type=GRAPH_TYPE,
+    nodes_file=DATASET_NAME,
+    edges_file=DATASET_NAME,
+    locations_file=LOCATIONS_DATA_FILE,
+    blacklist_file=TRAVELS_BLACK_LIST_FILE,
+):
+    """Return a per-request view of the base graph for a dataset and graph type
+
+    The base graph is built once per process (and again only when its data
+    files change) and every call gets its own view of it, see
+    :py:meth:`diogenetGraph.get_view`. Parameters are the same of
+    :py:class:`diogenetGraph`.
+    """
+    key = (graph_type, nodes_file, edges_file, locations_file, blacklist_file)
+    mtimes = get_data_files_mtimes(
+        nodes_file, edges_file, locations_file, blacklist_file
+    )
+    with _graph_registry_lock:
+        entry = _graph_registry.get(key)
+    if entry is None or entry[0] != mtimes:
+        base_graph = diogenetGraph(*key)
+        base_graph.data_mtimes = mtimes
+        with _graph_registry_lock:
+            _graph_registry[key] = (mtimes, base_graph)
+    else:
+        base_graph = entry[1]
+    return base_graph.get_view()
+
+
+def warm_up_graph(graph_type, dataset):
+    """Build the base graph of a dataset and compute the subgraph,
+    centralities, communities and layout of its default view
+
+    :param str graph_type: "global", "local", "communities" or "map"
+    :param str dataset: Name of the dataset in the datasets list
+    """
+    graph = get_graph(
+        graph_type, dataset, dataset, LOCATIONS_DATA_FILE, TRAVELS_BLACK_LIST_FILE
+    )
+    if graph.igraph_graph is None:
+        return
+    if graph_type == "local":
+        ego = DEFAULT_EGOS.get(dataset)
+        if ego not in graph.igraph_graph.vs["name"]:
+            return
+        graph.local_phylosopher = ego
+        graph.local_order = DEFAULT_LOCAL_ORDER
+    if graph_type != "map":
+        graph.set_edges_filter(DEFAULT_EDGES_FILTER)
+    graph.create_subgraph()
+    graph.get_sorted_centrality_table(normalized=True)
+    if graph_type == "communities":
+        graph.comm_alg = DEFAULT_COMM_ALG
+        graph.identify_communities()
+    if graph_type != "map":
+        graph.set_graph_layout(DEFAULT_LAYOUT)
+
+
+def warm_up(graph_types=WARM_UP_GRAPH_TYPES, datasets=None, background=False):
+    """Precompute the default views of every dataset, so the first requests
+    only read the caches
+
+    :param graph_types: Types of the graphs to warm up
+    :param datasets: Names of the datasets, by default every dataset in the
+    datasets list
+    :param bool background: Run in a daemon thread instead of blocking
+    :return: The thread when background is True
+    :rtype: :py:class:`threading.Thread`
+    """
+    if background:
+        thread = threading.Thread(
+            target=warm_up, args=(graph_types, datasets), daemon=True
+        )
+        thread.start()
+        return thread
+    if datasets is None:
+        datasets = da.get_dataset_list()["name"].unique().tolist()
+    for dataset in datasets:
+        for graph_type in graph_types:
+            try:
+                warm_up_graph(graph_type, dataset)
+            except Exception as error:
+                warnings.warn(
+                    "Warm up of the {} graph of {} failed: {}".format(
+                        graph_type, dataset, error
+                    )
+                )
 
 
-map_graph = diogenetGraph(
+map_graph = get_graph(
     "map",
     DATASET_NAME,
     DATASET_NAME,
@@ -1392,7 +2727,7 @@ map_graph = diogenetGraph(
     TRAVELS_BLACK_LIST_FILE,
 )
 
-global_graph = diogenetGraph(
+global_graph = get_graph(
     "global",
     DATASET_NAME,
     DATASET_NAME,
@@ -1400,7 +2735,7 @@ global_graph = diogenetGraph(
     TRAVELS_BLACK_LIST_FILE,
 )
 
-local_graph = diogenetGraph(
+local_graph = get_graph(
     "local",
     DATASET_NAME,
     DATASET_NAME,
@@ -1408,7 +2743,7 @@ local_graph = diogenetGraph(
     TRAVELS_BLACK_LIST_FILE,
 )
 
-communities_graph = diogenetGraph(
+communities_graph = get_graph(
     "communities",
     DATASET_NAME,
     DATASET_NAME,
@@ -1419,22 +2754,9 @@ communities_graph = diogenetGraph(
 
 def map_graph_change_dataset(dataset):
     global map_graph
-    if dataset == "iamblichus":
-        map_graph = diogenetGraph(
-            "map",
-            "new_Nodes_Life_of_Pythagoras_Iamblichus.csv",
-            "new_Edges_Life_of_Pythagoras_Iamblichus.csv",
-            LOCATIONS_DATA_FILE,
-            TRAVELS_BLACK_LIST_FILE,
-        )
-    else:
-        map_graph = diogenetGraph(
-            "map",
-            NODES_DATA_FILE,
-            EDGES_DATA_FILE,
-            LOCATIONS_DATA_FILE,
-            TRAVELS_BLACK_LIST_FILE,
-        )
+    map_graph = get_graph(
+        "map", dataset, dataset, LOCATIONS_DATA_FILE, TRAVELS_BLACK_LIST_FILE,
+    )
     return map_graph
 
 
@@ -6,8 +6,9 @@ from dash.exceptions import PreventUpdate
 import pathlib
 import os
 import sys
+import uuid
+import warnings
 import requests
-import tempfile
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
@@ -16,6 +17,7 @@ from flask import (
     render_template,
     make_response,
     request,
+    session,
     send_from_directory,
     send_file,
     jsonify,
@@ -23,10 +25,10 @@ from flask import (
 import base64
 import datetime
 import io
-import networkx as nx
 import folium
 
-from data_analysis_module.network_graph import diogenetGraph
+from data_analysis_module.network_graph import get_graph, warm_up
+import data_analysis_module.html_store as hs
 
 app = dash.Dash(__name__,
         external_stylesheets= [dbc.themes.BOOTSTRAP, 
@@ -38,6 +40,79 @@ app = dash.Dash(__name__,
 # app.config.suppress_callback_exceptions = True 
 
 server = app.server
+# Signs the session cookie that identifies the warm start positions of each user
+server.secret_key = os.environ.get("DIOGENET_SECRET_KEY") or os.urandom(24)
+
+
+@server.route(app.config.routes_pathname_prefix + "rendered/<key>")
+def serve_rendered_html(key):
+    rendered_html = hs.get_rendered_html(key)
+    if rendered_html is None:
+        return make_response("Graph not available, please reload the page", 404)
+    response = make_response(rendered_html)
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    return response
+
+
+@server.route(app.config.routes_pathname_prefix + "payload/<key>")
+def serve_vis_payload(key):
+    compressed = "gzip" in request.headers.get("Accept-Encoding", "")
+    payload = hs.get_vis_payload(key, compressed)
+    if payload is None:
+        return make_response("Graph not available, please reload the page", 404)
+    response = make_response(payload)
+    response.headers["Content-Type"] = "application/json"
+    if compressed:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+# Precompute the default views of every dataset in a background thread
+# after startup, so the first visitors only read the caches
+WARM_UP_ON_STARTUP = True
+
+if WARM_UP_ON_STARTUP:
+    warm_up(("map",), background=True)
+
+
+def get_rendered_html_url(key):
+    return app.get_relative_path("/rendered/" + key)
+
+
+# Renderer of the network graphs: "pyvis" (full html pages) or "visjs"
+# (json payloads drawn by assets/vis_graph.html)
+GRAPH_RENDERER = "pyvis"
+
+# Refine the fr and kk layouts from the positions of the previous graph, so
+# the graph keeps its shape when a filter changes
+LAYOUT_WARM_START = True
+
+
+def get_layout_session():
+    """Return a key identifying the session of the current user
+    """
+    if "layout_session" not in session:
+        session["layout_session"] = uuid.uuid4().hex
+    return session["layout_session"]
+
+
+def render_graph(graph, **render_params):
+    """Render the current subgraph of graph and return the url of the page
+       showing it, None if there is nothing to render
+    """
+    graph.layout_warm_start = LAYOUT_WARM_START
+    if LAYOUT_WARM_START:
+        graph.set_layout_session(get_layout_session())
+    if GRAPH_RENDERER == "visjs":
+        render_key = hs.render_vis_payload(graph, **render_params)
+        if render_key:
+            payload_url = app.get_relative_path("/payload/" + render_key)
+            return app.get_asset_url("vis_graph.html") + "?payload=" + payload_url
+    else:
+        render_key = hs.render_pyvis(graph, **render_params)
+        if render_key:
+            return get_rendered_html_url(render_key)
+    return None
 
 ############################################# Map graph layout###################################
 dict_of_datasets = {'Diogenes Laertius': 'diogenes', 'Life of Pythagoras Iamblichus': 'iamblichus', 'Custom Dataset': 'custom'}
@@ -364,7 +439,7 @@ def get_traveler(dataset_selection,
             multi=True
         ),
     if dataset_selection != "custom":
-        map_graph = diogenetGraph(
+        map_graph = get_graph(
         "map",
         dataset_selection,
         dataset_selection,
@@ -406,7 +481,7 @@ def get_map_map_custom(
                                     dataframe_upload):
 
     if dataset_selection == 'custom' and dataframe_upload is not None:
-        map_graph = diogenetGraph(
+        map_graph = get_graph(
         "map",
         "diogenes",
         "diogenes",
@@ -416,6 +491,13 @@ def get_map_map_custom(
         
         if tab == "map_maps":
             #print(traveler)
+            render_key = map_graph.get_render_key(
+                "folium_custom",
+                {"traveler": traveler, "dataframe_upload": dataframe_upload},
+            )
+            if hs.has_rendered_html(render_key):
+                return [html.Iframe(src=get_rendered_html_url(render_key),style={"height":"100%", "width": "100%"})]
+
             df_to_search_data = pd.DataFrame.from_dict(dataframe_upload)
             if traveler == "All" or len(traveler)==0:
                 df = map_graph.create_edges_for_custom_map(df_to_search_data)
@@ -424,6 +506,17 @@ def get_map_map_custom(
                 df_prev_filter_copy = df_prev_filter.copy()
                 df = df_prev_filter_copy.loc[df_prev_filter_copy['name'].isin(list(traveler))].reset_index(drop=True)
 
+            # Places missing from locations_data.csv have no coordinates to draw
+            unknown_places = df[["lat_source", "lon_source", "lat_target", "lon_target"]].isna().any(axis=1)
+            if unknown_places.any():
+                warnings.warn(
+                    "Skipping {} travels with unknown places: {}".format(
+                        int(unknown_places.sum()),
+                        ", ".join(sorted(set(df.loc[unknown_places & df["lat_source"].isna(), "source"]) | set(df.loc[unknown_places & df["lat_target"].isna(), "target"]))),
+                    )
+                )
+                df = df.loc[~unknown_places].reset_index(drop=True)
+
             #Folium base map configurations
             url = 'https://basemap.nationalmap.gov/arcgis/rest/services/USGSImageryOnly/MapServer/tile/{z}/{y}/{x}'
             attribution = '&copy; <a href="https://developers.arcgis.com/">ArcGIS</a> '
@@ -491,19 +584,15 @@ def get_map_map_custom(
                         weight=1.5,
                     ).add_to(base_map)
             
-            suffix = ".html"
-            temp_file_name = next(tempfile._get_candidate_names()) + suffix
-            full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-
             #saving folium .html file
             folium.LayerControl().add_to(base_map)
-            base_map.save(full_filename)
+            hs.put_rendered_html(render_key, base_map.get_root().render())
 
-            return [html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"100%", "width": "100%"})]
+            return [html.Iframe(src=get_rendered_html_url(render_key),style={"height":"100%", "width": "100%"})]
             
         
     if dataset_selection != 'custom':
-        map_graph = diogenetGraph(
+        map_graph = get_graph(
         "map",
         dataset_selection,
         dataset_selection,
@@ -524,7 +613,12 @@ def get_map_map_custom(
                     map_graph.set_edges_filter(m_filter)
                 map_graph.create_subgraph()
 
-            
+            render_key = map_graph.get_render_key(
+                "folium", {"min_weight": node_size[0], "max_weight": node_size[1]}
+            )
+            if hs.has_rendered_html(render_key):
+                return html.Iframe(src=get_rendered_html_url(render_key),style={"height":"800px", "width": "100%"})
+
             data = map_graph.get_map_data(min_weight=node_size[0], max_weight=node_size[1])
             df = pd.DataFrame(data)
 
@@ -595,15 +689,11 @@ def get_map_map_custom(
                         weight=1.5,
                     ).add_to(base_map)
             
-            suffix = ".html"
-            temp_file_name = next(tempfile._get_candidate_names()) + suffix
-            full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
-            
             #saving folium .html file
             folium.LayerControl().add_to(base_map)
-            base_map.save(full_filename)
+            hs.put_rendered_html(render_key, base_map.get_root().render())
 
-            return html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"800px", "width": "100%"})
+            return html.Iframe(src=get_rendered_html_url(render_key),style={"height":"800px", "width": "100%"})
 
         if tab == "map_metrics":
             
@@ -626,29 +716,7 @@ def get_map_map_custom(
                     map_graph.set_edges_filter(m_filter)
                 map_graph.create_subgraph()
 
-            def round_list_values(list_in):
-                return [round(value, 4) for value in list_in]
- 
-            
-            calculated_network_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(map_graph.networkx_subgraph).items())[1])
-            calculated_network_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(map_graph.networkx_subgraph).items())[1])
-            calculated_network_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(map_graph.networkx_subgraph).items())[1])
-            calculated_network_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(map_graph.networkx_subgraph).items())[1])
-
-            calculated_degree = [round(value) for value in map_graph.calculate_degree()]
-            calculated_betweenness = round_list_values(map_graph.calculate_betweenness())
-            calculated_closeness = round_list_values(map_graph.calculate_closeness())
-            calculated_eigenvector = round_list_values(map_graph.calculate_eigenvector())
-
-            dict_map_data_tables ={
-                "City": map_graph.get_vertex_names(),
-                "Degree": round_list_values(calculated_network_degree),
-                "Betweeness": round_list_values(calculated_network_eigenvector),
-                "Closeness": round_list_values(calculated_network_closeness),
-                "Eigenvector": round_list_values(calculated_network_eigenvector), 
-            }
-
-            df_map_data_tables = pd.DataFrame(dict_map_data_tables)
+            df_map_data_tables = map_graph.centrality_table(normalized=True).round(4).rename_axis("City").reset_index()
             
             dt_map = dash_table.DataTable( 
                 id='table-map', 
@@ -667,7 +735,7 @@ def get_map_map_custom(
                 sort_mode='single',
                 sort_by=[{'column_id': 'Degree', 'direction': 'asc'}]
             )
-            foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('Networkx', href='https://networkx.org/documentation/stable/', target='_blank')])
+            foot_note = html.Div(children=[html.Span('Metrics obtained using the algorithms of '), html.A('igraph', href='https://igraph.org/python/', target='_blank')])
             return [html.H6('Centrality Scores',className="mt-1 mb-2 text-center"), html.Hr(className='py-0'), dt_map, foot_note]
         
         if tab == "map_graphs":
@@ -675,11 +743,12 @@ def get_map_map_custom(
             map_graph.current_centrality_index = centrality_index
             
             graph_layout = "fr"
-            pvis_graph = None
+            graph_url = None
 
             if traveler == "All" or traveler == []:
                 #map_graph.edges_filter = []
-                pvis_graph = map_graph.get_pyvis(
+                graph_url = render_graph(
+                    map_graph,
                     min_weight=node_size[0],
                     max_weight=node_size[1],
                     min_label_size=label_size[0],
@@ -690,15 +759,10 @@ def get_map_map_custom(
                 for m_filter in traveler:
                     map_graph.set_edges_filter(m_filter)
                 map_graph.create_subgraph()
-                pvis_graph = map_graph.get_pyvis()
-
-            if pvis_graph:
-                suffix = ".html"
-                temp_file_name = next(tempfile._get_candidate_names()) + suffix
-                full_filename = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '.', 'assets',temp_file_name))
+                graph_url = render_graph(map_graph)
 
-                pvis_graph.write_html(full_filename)
-                return html.Iframe(src=app.get_asset_url(f'{temp_file_name}'),style={"height":"800px", "width": "100%"})
+            if graph_url:
+                return html.Iframe(src=graph_url,style={"height":"800px", "width": "100%"})
 
 
 @app.callback(
@@ -716,7 +780,7 @@ def update_table(
                 dataset_selection,
                 traveler,
 ):
-    map_graph = diogenetGraph(
+    map_graph = get_graph(
         "map",
         dataset_selection,
         dataset_selection,
@@ -742,43 +806,19 @@ def update_table(
             map_graph.set_edges_filter(m_filter)
         map_graph.create_subgraph()
 
-    def round_list_values(list_in):
-        return [round(value, 4) for value in list_in]
-
-    calculated_network_betweenness = list(pd.DataFrame.from_dict(nx.betweenness_centrality(map_graph.networkx_subgraph).items())[1])
-    calculated_network_degree = list(pd.DataFrame.from_dict(nx.degree_centrality(map_graph.networkx_subgraph).items())[1])
-    calculated_network_closeness = list(pd.DataFrame.from_dict(nx.closeness_centrality(map_graph.networkx_subgraph).items())[1])
-    calculated_network_eigenvector = list(pd.DataFrame.from_dict(nx.eigenvector_centrality(map_graph.networkx_subgraph).items())[1])
-    
-    calculated_degree = [round(value) for value in map_graph.calculate_degree()]
-    calculated_betweenness = round_list_values(map_graph.calculate_betweenness())
-    calculated_closeness = round_list_values(map_graph.calculate_closeness())
-    calculated_eigenvector = round_list_values(map_graph.calculate_eigenvector())
-
-    dict_map_data_tables ={
-        "City": map_graph.get_vertex_names(),
-        "Degree": round_list_values(calculated_network_degree),
-        "Betweeness": round_list_values(calculated_network_eigenvector),
-        "Closeness": round_list_values(calculated_network_closeness),
-        "Eigenvector": round_list_values(calculated_network_eigenvector), 
-    }
-
-    df_map_data_tables = pd.DataFrame(dict_map_data_tables)
-    
-    #print(sort_by)
+    sort_column = None
+    ascending = True
     if len(sort_by):
-        dff = df_map_data_tables.sort_values(
-            sort_by[0]['column_id'],
-            ascending=sort_by[0]['direction'] == 'desc',
-            inplace=False
-        )
-    else:
-        # No sort is applied
-        dff = df_map_data_tables
+        sort_column = sort_by[0]['column_id']
+        if sort_column == "City":
+            sort_column = "Phylosopher"
+        ascending = sort_by[0]['direction'] == 'desc'
+
+    dff = map_graph.get_centrality_table_page(
+        page_current, page_size, sort_column, ascending, normalized=True
+    )
 
-    return dff.iloc[
-        page_current*page_size:(page_current+ 1)*page_size
-    ].to_dict('records')
+    return dff.round(4).rename(columns={"Phylosopher": "City"}).to_dict('records')
 
 @app.callback(
     Output("download-dataframe-csv-map", "data"),
@@ -800,7 +840,7 @@ def download_handler(n_clicks,
                     dataframe_upload):
 
     if dataset_selection == 'custom':
-        map_graph = diogenetGraph(
+        map_graph = get_graph(
         "map",
         "diogenes",
         "diogenes",
@@ -829,7 +869,7 @@ def download_handler(n_clicks,
             
 
     if dataset_selection != 'custom':
-        map_graph = diogenetGraph(
+        map_graph = get_graph(
         "map",
         dataset_selection,
         dataset_selection,
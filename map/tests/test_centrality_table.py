@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis_module.network_graph import get_graph
+
+
+@pytest.fixture(scope="module")
+def map_graph():
+    graph = get_graph(
+        "map", "diogenes", "diogenes", "locations_data.csv", "travels_blacklist.csv"
+    )
+    graph.edges_filter = []
+    graph.create_subgraph()
+    return graph
+
+
+def test_map_graph_has_parallel_travels(map_graph):
+    assert any(map_graph.get_current_subgraph().is_multiple())
+
+
+def test_degree_counts_each_neighbour_once(map_graph):
+    subgraph = map_graph.get_current_subgraph()
+    table = map_graph.centrality_table()
+    neighbours = [len(set(subgraph.neighbors(vertex))) for vertex in subgraph.vs]
+    assert table["Degree"].tolist() == neighbours
+
+
+def test_igraph_table_matches_networkx(map_graph):
+    table = map_graph.centrality_table(normalized=True)
+    networkx_table = map_graph.centrality_table(normalized=True, backend="networkx")
+    networkx_table = networkx_table.loc[table.index]
+    for column in ("Degree", "Betweeness", "Closeness"):
+        assert table[column].to_numpy() == pytest.approx(
+            networkx_table[column].to_numpy(), abs=1e-9
+        )
+    # NetworkX stops its power iteration at a looser tolerance than igraph
+    assert table["Eigenvector"].to_numpy() == pytest.approx(
+        networkx_table["Eigenvector"].to_numpy(), abs=1e-4
+    )